@@ -0,0 +1,34 @@
+# services/bq_hot_loader/app/clients.py
+"""
+Process-wide Google Cloud clients.
+
+Each client construction spins up its own credentials refresh thread and
+requests.Session; sharing one instance per process avoids duplicate TCP
+pools and token refreshes when several components need the same service.
+The HTTP adapter pool is widened so the multi-threaded Pub/Sub scheduler
+doesn't contend for connections.
+"""
+import functools
+
+import requests.adapters
+from google.cloud import bigquery, pubsub_v1
+
+
+def _widen_pool(client, size: int = 64) -> None:
+    try:
+        adapter = requests.adapters.HTTPAdapter(pool_connections=size, pool_maxsize=size)
+        client._http.mount("https://", adapter)
+    except AttributeError:
+        pass
+
+
+@functools.lru_cache(maxsize=1)
+def bq_client() -> bigquery.Client:
+    client = bigquery.Client()
+    _widen_pool(client)
+    return client
+
+
+@functools.lru_cache(maxsize=1)
+def subscriber_client() -> pubsub_v1.SubscriberClient:
+    return pubsub_v1.SubscriberClient()
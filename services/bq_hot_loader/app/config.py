@@ -4,6 +4,9 @@ PROJECT_ID = os.environ.get("PROJECT_ID")
 SUBSCRIPTION_ID = os.environ.get("SUBSCRIPTION_ID")
 BRONZE_DATASET = os.environ.get("BRONZE_DATASET", "relay_bronze")
 BRONZE_TABLE = os.environ.get("BRONZE_TABLE", "parcel_events")
+# Opt-in gRPC append path via the BigQuery Storage Write API; the legacy
+# streaming insert path stays the default.
+USE_STORAGE_WRITE_API = os.environ.get("USE_STORAGE_WRITE_API", "").lower() in ("1", "true", "yes")
 SCHEMA_DIR = os.path.join(
     os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
     "data_contracts", "schemas"
@@ -0,0 +1,45 @@
+# services/bq_hot_loader/app/contracts.py
+"""
+Shared, cached loading of the envelope and event contract schemas.
+
+BigQueryLoader and EventValidator previously each listed the events
+directory and parsed every file themselves. This loader scans the
+directory once per schema_dir (os.scandir avoids the extra stat per file
+that listdir+open incurs), parses with orjson, and memoizes the result so
+the second consumer in the process gets the already-parsed dicts.
+"""
+import functools
+import os
+from pathlib import Path
+from typing import Dict, Tuple
+
+
+import orjson
+
+
+@functools.lru_cache(maxsize=4)
+def load_contracts(schema_dir: str) -> Tuple[Dict, Dict[str, Dict]]:
+    """Return (envelope, {filename: contract}) parsed once per schema_dir."""
+    envelope_path = Path(schema_dir) / "event-envelope.schema.json"
+    if not envelope_path.exists():
+        raise RuntimeError(f"Envelope schema not found: {envelope_path}")
+    envelope = orjson.loads(envelope_path.read_bytes())
+
+    events_dir = os.path.join(schema_dir, "events")
+    if not os.path.isdir(events_dir):
+        raise RuntimeError(f"Events schema directory not found: {events_dir}")
+
+    with os.scandir(events_dir) as it:
+        entries = sorted(
+            (e for e in it if e.name.endswith(".schema.json") and e.is_file()),
+            key=lambda e: e.name,
+        )
+
+    contracts: Dict[str, Dict] = {}
+    for entry in entries:
+        try:
+            contracts[entry.name] = orjson.loads(Path(entry.path).read_bytes())
+        except Exception as e:
+            print(f"[contracts] Skipping {entry.name}: {e}")
+
+    return envelope, contracts
@@ -1,13 +1,17 @@
 # services/bq_hot_loader/app/loader.py
-import json
+import logging
 import os
 import time
-from typing import Dict, List, Tuple
+from typing import Dict, List, Set, Tuple
 
 from google.cloud import bigquery
 from google.api_core.exceptions import NotFound, Conflict, PreconditionFailed
 
 from app import config
+from app.clients import bq_client
+from app.contracts import load_contracts
+
+logger = logging.getLogger("bq_hot_loader.loader")
 
 # Schema helpers: load JSON Schemas and map to BigQuery types
 _JSON_TO_BQ_PRIMITIVES = {
@@ -17,10 +21,6 @@ _JSON_TO_BQ_PRIMITIVES = {
     "boolean": "BOOL",
 }
 
-def _load_json(path: str) -> Dict:
-    with open(path, "r") as f:
-        return json.load(f)
-
 def _bq_type_from_json_schema(field_name: str, field_schema: Dict) -> str:
     t = field_schema.get("type")
     if isinstance(t, list):
@@ -53,6 +53,10 @@ def _merge_contract_props(envelope: Dict, event_contract: Dict) -> Dict[str, Dic
     return merged
 
 def _fill_missing_fields(event: Dict, all_props: Dict[str, Dict]) -> Dict:
+    # Off the default insert path: BigQuery NULLABLE columns already treat
+    # absent JSON keys as NULL, so padding events with explicit Nones only
+    # costs an extra dict per row. Kept behind BigQueryLoader.fill_missing
+    # for callers that want fully materialized rows.
     filled = dict(event)
     for k in all_props.keys():
         if k not in filled:
@@ -66,6 +70,18 @@ def _bq_schema_from_contract_props(all_props: Dict[str, Dict]) -> List[bigquery.
         fields.append(bigquery.SchemaField(name, bq_type, mode="NULLABLE"))
     return fields
 
+def _infer_extra_bq_type(name: str, value) -> str:
+    """Infer a BQ type for a producer field that isn't in the contract."""
+    if isinstance(value, bool):
+        return "BOOL"
+    if isinstance(value, int):
+        return "INT64"
+    if isinstance(value, float):
+        return "NUMERIC"
+    if isinstance(value, str) and name.endswith("_ts"):
+        return "TIMESTAMP"
+    return "STRING"
+
 def _append_new_fields(existing: List[bigquery.SchemaField],
                        desired: List[bigquery.SchemaField]) -> Tuple[List[bigquery.SchemaField], bool]:
     by_name = {f.name: f for f in existing}
@@ -95,7 +111,9 @@ class BigQueryLoader:
     """
 
     def __init__(self):
-        self.client = bigquery.Client()
+        # Shared process-wide client; its session pool is sized for the
+        # multi-threaded Pub/Sub scheduler.
+        self.client = bq_client()
         self.project_id = config.PROJECT_ID
         self.dataset_id = getattr(config, "BRONZE_DATASET", "relay_bronze")
         self.table_name = getattr(config, "BRONZE_TABLE", "parcel_events")
@@ -105,40 +123,65 @@ class BigQueryLoader:
         if not self.schema_dir:
             raise RuntimeError("SCHEMA_DIR must be set in config for schema-aware loader.")
 
-        # Envelope
-        self.envelope = _load_json(os.path.join(self.schema_dir, "event-envelope.schema.json"))
+        # Envelope + event contracts come from the shared cached loader so
+        # the validator in the same process reuses the parsed dicts.
+        self.envelope, contract_files = load_contracts(self.schema_dir)
         env_props = list((self.envelope.get("properties") or {}).keys())
-        print(f"[BigQueryLoader] Loaded envelope: event-envelope.schema.json props={len(env_props)} -> {env_props}")
+        logger.info("Loaded envelope: event-envelope.schema.json props=%d -> %s", len(env_props), env_props)
 
         # Event contracts (NO '.SCHEMA' suffix; keys match event_type)
         self.event_contracts: Dict[str, Dict] = {}
         events_dir = os.path.join(self.schema_dir, "events")
-        print(f"[BigQueryLoader] Loading event contracts from: {events_dir}")
+        logger.info("Loading event contracts from: %s", events_dir)
 
-        for fn in os.listdir(events_dir):
-            if not fn.endswith(".schema.json"):
-                continue
-            path = os.path.join(events_dir, fn)
-            try:
-                contract = _load_json(path)
-            except Exception as e:
-                print(f"[BigQueryLoader]   ! skip {fn}: {e}")
-                continue
-
-            basename = fn
-            if basename.endswith(".schema.json"):
-                basename = basename[:-len(".schema.json")]  # strip both extensions
-            key = basename.upper().replace("-", "_")       # e.g. PARCEL_CREATED
+        for fn, contract in contract_files.items():
+            basename = fn[:-len(".schema.json")]        # strip both extensions
+            key = basename.upper().replace("-", "_")    # e.g. PARCEL_CREATED
             self.event_contracts[key] = contract
 
             props = list(_extract_event_properties(contract).keys())
-            print(f"[BigQueryLoader]   -> {fn}: key={key} props={len(props)} {props}")
+            logger.info("  -> %s: key=%s props=%d %s", fn, key, len(props), props)
 
         if not self.event_contracts:
             raise RuntimeError(f"No event contracts loaded from {events_dir}")
 
         loaded_keys = ", ".join(sorted(self.event_contracts.keys()))
-        print(f"[BigQueryLoader] Loaded {len(self.event_contracts)} contracts: {loaded_keys}")
+        logger.info("Loaded %d contracts: %s", len(self.event_contracts), loaded_keys)
+
+        # Envelope and contracts are immutable after startup, so merge them
+        # once per event type here instead of re-walking allOf branches and
+        # rebuilding dicts on every insert. _schema_fields holds the final
+        # per-type SchemaField tuples, so _bq_type_from_json_schema runs
+        # exactly once per (event_type, field) for the process lifetime.
+        self.merged_props: Dict[str, Dict[str, Dict]] = {}
+        self._schema_fields: Dict[str, Tuple[bigquery.SchemaField, ...]] = {}
+        self.contract_keysets: Dict[str, frozenset] = {}
+        for key, contract in self.event_contracts.items():
+            merged = _merge_contract_props(self.envelope, contract)
+            self.merged_props[key] = merged
+            self._schema_fields[key] = tuple(_bq_schema_from_contract_props(merged))
+            self.contract_keysets[key] = frozenset(merged.keys())
+
+        # Optional Storage Write API path (gRPC/protobuf on the _default
+        # stream) for higher-throughput appends; off unless configured.
+        self._storage_writer = None
+        if getattr(config, "USE_STORAGE_WRITE_API", False):
+            from app.storage_write import StorageWriteAppender
+            self._storage_writer = StorageWriteAppender(
+                self.project_id, self.dataset_id, self.table_name
+            )
+            logger.info("Using Storage Write API for %s", self.table_id)
+
+        # Memo of fully built schema-field lists keyed by
+        # (event key, extras signature); extras rarely change per producer.
+        self._desired_cache: Dict[Tuple[str, Tuple[Tuple[str, str], ...]],
+                                  List[bigquery.SchemaField]] = {}
+        # Shapes whose columns are already known to exist in the table.
+        self._schema_verified: Set[Tuple[str, Tuple[Tuple[str, str], ...]]] = set()
+
+        # Pad rows with explicit NULLs for absent contract fields. NULLABLE
+        # columns make this redundant, so it defaults off.
+        self.fill_missing = False
 
         self.table_ready = False
 
@@ -153,45 +196,60 @@ class BigQueryLoader:
             )
         return contract
 
-    def _desired_schema_fields(self, event: Dict) -> List[bigquery.SchemaField]:
+    def _extras_signature(self, event: Dict, key: str) -> Tuple[Tuple[str, str], ...]:
+        """Stable (name, bq_type) signature of producer fields not in the contract."""
+        contract_keys = self.contract_keysets[key]
+        return tuple(sorted(
+            (k, _infer_extra_bq_type(k, v))
+            for k, v in event.items() if k not in contract_keys
+        ))
+
+    def _desired_schema_fields(self, event: Dict, key: str = None) -> List[bigquery.SchemaField]:
         evt_type = event.get("event_type", "")
-        contract = self._contract_for_event(evt_type)
-        all_props = _merge_contract_props(self.envelope, contract)
+        if key is None:
+            key = (evt_type or "").upper()
+        if key not in self.merged_props:
+            # Raises the usual "no contract loaded" error with context
+            self._contract_for_event(evt_type)
+
+        extras_sig = self._extras_signature(event, key)
+        cached = self._desired_cache.get((key, extras_sig))
+        if cached is not None:
+            return cached
 
-        # Log merged contract keys used for BQ schema
-        print(f"[BigQueryLoader] Building BQ schema for {evt_type}: "
-              f"{len(all_props)} contract fields -> {list(all_props.keys())}")
+        all_props = self.merged_props[key]
 
-        desired = _bq_schema_from_contract_props(all_props)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Building BQ schema for %s: %d contract fields -> %s",
+                         evt_type, len(all_props), list(all_props.keys()))
+
+        desired = list(self._schema_fields[key])
 
         # Include extra producer fields not in the contract
-        contract_keys = set(all_props.keys())
-        extras = [k for k in event.keys() if k not in contract_keys]
-        if extras:
-            print(f"[BigQueryLoader]   Extra fields in event (added additively): {extras}")
-        for k in extras:
-            v = event[k]
-            if isinstance(v, bool):
-                t = "BOOL"
-            elif isinstance(v, int):
-                t = "INT64"
-            elif isinstance(v, float):
-                t = "NUMERIC"
-            else:
-                t = "TIMESTAMP" if isinstance(v, str) and k.endswith("_ts") else "STRING"
-            desired.append(bigquery.SchemaField(k, t, mode="NULLABLE"))
+        if extras_sig and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Extra fields in event (added additively): %s",
+                         [name for name, _ in extras_sig])
+        for name, t in extras_sig:
+            desired.append(bigquery.SchemaField(name, t, mode="NULLABLE"))
 
         # Show a preview of the final BQ schema (name:type)
-        preview = [f"{f.name}:{f.field_type}" for f in desired]
-        print(f"[BigQueryLoader] Final desired BQ schema ({len(desired)} fields): {preview}")
+        if logger.isEnabledFor(logging.DEBUG):
+            preview = [f"{f.name}:{f.field_type}" for f in desired]
+            logger.debug("Final desired BQ schema (%d fields): %s", len(desired), preview)
 
+        self._desired_cache[(key, extras_sig)] = desired
         return desired
 
     def _ensure_table_once(self, first_event: Dict):
+        # True short-circuit: once the table is known to exist, don't pay a
+        # get_table RPC per insert.
+        if self.table_ready:
+            return
+
         try:
             self.client.get_table(self.table_id)
             self.table_ready = True
-            print(f"[BigQueryLoader] Found existing table: {self.table_id}")
+            logger.debug("Found existing table: %s", self.table_id)
             return
         except NotFound:
             pass
@@ -208,52 +266,101 @@ class BigQueryLoader:
 
         try:
             self.client.create_table(table)
-            print(f"[BigQueryLoader] Created BigQuery table {self.table_id}")
+            logger.info("Created BigQuery table %s", self.table_id)
         except Conflict:
-            print(f"[BigQueryLoader] Table {self.table_id} already exists after conflict — continuing.")
+            logger.info("Table %s already exists after conflict — continuing.", self.table_id)
 
         self.table_ready = True
 
-    def _ensure_schema_superset(self, event: Dict, max_retries: int = 3):
-        desired_fields = self._desired_schema_fields(event)
+    def _ensure_schema_superset(self, event: Dict, key: str = None, max_retries: int = 3):
+        # The table schema only changes when a new column shows up, so once a
+        # given (event_type, extras) shape has been verified there's nothing
+        # left to check — skip the get_table RPC entirely.
+        if key is None:
+            key = (event.get("event_type", "") or "").upper()
+        sig = (key, self._extras_signature(event, key)) if key in self.contract_keysets else None
+        if sig is not None and sig in self._schema_verified:
+            return
+
+        desired_fields = self._desired_schema_fields(event, key)
 
         for attempt in range(max_retries):
             table = self.client.get_table(self.table_id)
             merged, changed = _append_new_fields(table.schema, desired_fields)
             if not changed:
+                if sig is not None:
+                    self._schema_verified.add(sig)
                 return
 
             table.schema = merged
             try:
                 self.client.update_table(table, ["schema"])
-                print(f"[BigQueryLoader] Extended schema for {self.table_id} with new columns.")
+                logger.info("Extended schema for %s with new columns.", self.table_id)
+                if sig is not None:
+                    self._schema_verified.add(sig)
                 return
             except PreconditionFailed:
                 if attempt < max_retries - 1:
                     backoff = 2 ** attempt
-                    print(f"[BigQueryLoader] Schema update race; retrying in {backoff}s...")
+                    logger.warning("Schema update race; retrying in %ds...", backoff)
                     time.sleep(backoff)
                 else:
-                    print(f"[BigQueryLoader] Failed to update schema after {max_retries} attempts.")
+                    logger.error("Failed to update schema after %d attempts.", max_retries)
                     return
 
-    def insert_event(self, event: Dict):
-        # Ensure table created
-        self._ensure_table_once(event)
+    def insert_event(self, event: Dict, key: str = None):
+        self.insert_events(event.get("event_type", ""), [event], key=key)
 
-        # Fill missing contract fields with None (so all contract cols are present)
-        contract = self._contract_for_event(event.get("event_type", ""))
-        all_props = _merge_contract_props(self.envelope, contract)
-        event_filled = _fill_missing_fields(event, all_props)
+    def insert_events(self, event_type: str, events: List[Dict], key: str = None):
+        """Insert a batch of same-type events with a single streaming request.
 
-        # Ensure schema can accept all keys
-        self._ensure_schema_superset(event_filled)
+        ``key`` is the resolved contract key as returned by
+        EventValidator.validate_event; when supplied the contract lookup is
+        skipped entirely.
+        """
+        if not events:
+            return
 
-        # Insert row
-        errors = self.client.insert_rows_json(
-            self.table_id,
-            [event_filled],
-            ignore_unknown_values=True,
-        )
-        if errors:
-            raise RuntimeError(f"BigQuery insert errors: {errors}")
+        # Ensure table created
+        self._ensure_table_once(events[0])
+
+        if key is None:
+            self._contract_for_event(event_type)
+            key = (event_type or "").upper()
+
+        # Absent contract fields land as NULL in the NULLABLE columns, so the
+        # raw events go straight through; extras detection in
+        # _extras_signature works off the raw keys either way.
+        if self.fill_missing:
+            rows = [_fill_missing_fields(event, self.merged_props[key]) for event in events]
+        else:
+            rows = events
+
+        # Sub-group rows by extras signature: the superset check and the
+        # desired schema depend on each row's shape, and a batch can mix
+        # rows with and without a novel producer field — checking only the
+        # first row would leave the new column uncreated and the value
+        # silently dropped (ignore_unknown_values) while the message acks.
+        # The common case (no extras anywhere) is still a single group.
+        groups: Dict[Tuple[Tuple[str, str], ...], List[Dict]] = {}
+        for row in rows:
+            groups.setdefault(self._extras_signature(row, key), []).append(row)
+
+        for group_rows in groups.values():
+            # Ensure schema can accept this group's keys; one check covers
+            # the group since its rows share event type and extras shape.
+            self._ensure_schema_superset(group_rows[0], key)
+
+            if self._storage_writer is not None:
+                self._storage_writer.append(
+                    self._desired_schema_fields(group_rows[0], key), group_rows)
+                continue
+
+            # Insert rows
+            errors = self.client.insert_rows_json(
+                self.table_id,
+                group_rows,
+                ignore_unknown_values=True,
+            )
+            if errors:
+                raise RuntimeError(f"BigQuery insert errors: {errors}")
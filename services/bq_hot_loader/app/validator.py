@@ -1,11 +1,15 @@
 # services/bq_hot_loader/app/validator.py
-import json
+import logging
 import os
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+import fastjsonschema
 from jsonschema import ValidationError, Draft202012Validator, RefResolver
 from app import config
+from app.contracts import load_contracts
+
+logger = logging.getLogger("bq_hot_loader.validator")
 
 ENVELOPE_URL = "https://relay-spec.example/schemas/event-envelope.schema.json"
 
@@ -14,6 +18,39 @@ def _normalize_event_key(s: str) -> str:
     return (s or "").strip().replace("-", "_").upper()
 
 
+def _inline_refs(node: Any, store: Dict[str, Dict[str, Any]]) -> Any:
+    """
+    Recursively replace $ref nodes that resolve against the local store with
+    the referenced schema itself. The result is a self-contained schema: the
+    compiled validator never consults a resolver, and ref-resolution cost is
+    paid once at startup instead of per message. Unknown refs are left as-is.
+    """
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if isinstance(ref, str) and ref in store:
+            target = _inline_refs(store[ref], store)
+            if len(node) == 1:
+                return target
+            # $ref with siblings: keep the siblings alongside the target.
+            merged = dict(target)
+            merged.update({k: _inline_refs(v, store) for k, v in node.items() if k != "$ref"})
+            return merged
+        return {k: _inline_refs(v, store) for k, v in node.items()}
+    if isinstance(node, list):
+        return [_inline_refs(v, store) for v in node]
+    return node
+
+
+def _has_refs(node: Any) -> bool:
+    if isinstance(node, dict):
+        if "$ref" in node:
+            return True
+        return any(_has_refs(v) for v in node.values())
+    if isinstance(node, list):
+        return any(_has_refs(v) for v in node)
+    return False
+
+
 def _extract_event_const(schema: Dict[str, Any]) -> Optional[str]:
     # direct
     try:
@@ -40,17 +77,16 @@ class EventValidator:
         if not self.schema_dir.exists():
             raise RuntimeError(f"Schema directory not found: {self.schema_dir}")
 
-        print(f"[EventValidator] SCHEMA_DIR={self.schema_dir}")
+        logger.info("SCHEMA_DIR=%s", self.schema_dir)
 
-        # Load the local envelope and register it under the remote URL so $ref hits the store.
-        envelope_path = self.schema_dir / "event-envelope.schema.json"
-        with envelope_path.open("r", encoding="utf-8") as f:
-            self.envelope_schema = json.load(f)
+        # Envelope + contracts come pre-parsed from the shared cached loader
+        # (one directory scan per process, shared with BigQueryLoader).
+        # The envelope is registered under the remote URL so $ref hits the store.
+        self.envelope_schema, contract_files = load_contracts(str(self.schema_dir))
 
         env_props = list(self.envelope_schema.get("properties", {}).keys())
-        print(f"[EventValidator] Loaded envelope: {envelope_path.name} "
-              f"($id={self.envelope_schema.get('$id')}) "
-              f"props={len(env_props)} -> {env_props}")
+        logger.info("Loaded envelope: event-envelope.schema.json ($id=%s) props=%d -> %s",
+                    self.envelope_schema.get("$id"), len(env_props), env_props)
 
         self.store: Dict[str, Dict[str, Any]] = {ENVELOPE_URL: self.envelope_schema}
         self.resolver = RefResolver(
@@ -59,22 +95,12 @@ class EventValidator:
             store=self.store,
         )
 
-        # Load all event contracts under .../schemas/events/*.schema.json
+        # Event contracts under .../schemas/events/*.schema.json
         events_dir = self.schema_dir / "events"
-        if not events_dir.exists():
-            raise RuntimeError(f"Events schema directory not found: {events_dir}")
-
-        print(f"[EventValidator] Loading event contracts from: {events_dir}")
+        logger.info("Loading event contracts from: %s", events_dir)
 
         self.schemas: Dict[str, Dict[str, Any]] = {}
-        for p in sorted(events_dir.glob("*.schema.json")):
-            try:
-                with p.open("r", encoding="utf-8") as f:
-                    schema = json.load(f)
-            except Exception as e:
-                print(f"[EventValidator] Skipping {p.name}: {e}")
-                continue
-
+        for fname, schema in contract_files.items():
             # Register by $id too (helps any $ref by URL)
             sid = schema.get("$id")
             if isinstance(sid, str) and sid:
@@ -90,7 +116,7 @@ class EventValidator:
                     key = _normalize_event_key(title)
                     source = "title"
                 else:
-                    key = _normalize_event_key(p.stem)
+                    key = _normalize_event_key(fname[:-len(".schema.json")])
                     source = "filename"
 
             # Skip envelope if ever found here
@@ -98,23 +124,59 @@ class EventValidator:
                 continue
 
             prop_names = list(schema.get("properties", {}).keys())
-            print(f"[EventValidator] Loaded contract: file={p.name} key={key} "
-                  f"(from {source}) props={len(prop_names)} -> {prop_names}")
+            logger.info("Loaded contract: file=%s key=%s (from %s) props=%d -> %s",
+                        fname, key, source, len(prop_names), prop_names)
 
             self.schemas[key] = schema
 
         if not self.schemas:
             raise RuntimeError(f"No event schemas loaded from {events_dir}")
 
+        # Compile one validator per event type up front. fastjsonschema
+        # code-generates a dedicated validation function per schema, so the
+        # per-message cost is a single function call instead of an interpretive
+        # schema walk. The envelope $ref is inlined into each schema first, so
+        # the compiled validators are self-contained and never touch a
+        # resolver; any $ref that survives inlining still resolves via the
+        # handlers map, never the network. Schemas that fastjsonschema can't
+        # compile fall back to a precompiled jsonschema validator.
+        # self.schemas is kept for diagnostics only.
+        handlers = {"https": lambda uri: self.store[uri]}
+        self.compiled: Dict[str, Any] = {}
+        self.validators: Dict[str, Draft202012Validator] = {}
+        for key, schema in self.schemas.items():
+            inlined = _inline_refs(schema, self.store)
+            Draft202012Validator.check_schema(inlined)
+            try:
+                self.compiled[key] = fastjsonschema.compile(inlined, handlers=handlers)
+            except Exception as e:
+                logger.warning("fastjsonschema compile failed for %s (%s); "
+                               "falling back to jsonschema", key, e)
+                if _has_refs(inlined):
+                    self.validators[key] = Draft202012Validator(inlined, resolver=self.resolver)
+                else:
+                    self.validators[key] = Draft202012Validator(inlined)
+
         loaded_keys = ", ".join(sorted(self.schemas.keys()))
-        print(f"[EventValidator] Loaded {len(self.schemas)} contracts: {loaded_keys}")
+        logger.info("Loaded %d contracts: %s", len(self.schemas), loaded_keys)
 
-    def validate_event(self, event: Dict[str, Any]) -> None:
+    def validate_event(self, event: Dict[str, Any]) -> str:
+        """Validate and return the resolved (uppercased) event key so callers
+        can reuse it instead of re-normalizing event_type downstream."""
         raw_key = event.get("event_type", "")
         event_key = _normalize_event_key(str(raw_key))
-        schema = self.schemas.get(event_key)
 
-        if schema is None:
+        compiled = self.compiled.get(event_key)
+        if compiled is not None:
+            try:
+                compiled(event)
+            except fastjsonschema.JsonSchemaException as e:
+                path = ".".join(map(str, e.path[1:])) or "<root>"
+                raise ValueError(f"Schema validation failed at {path}: {e.message}")
+            return event_key
+
+        validator = self.validators.get(event_key)
+        if validator is None:
             loaded = ", ".join(sorted(self.schemas.keys()))
             raise ValueError(
                 f"No event contract loaded for event_type={repr(raw_key)} "
@@ -122,7 +184,8 @@ class EventValidator:
             )
 
         try:
-            Draft202012Validator(schema, resolver=self.resolver).validate(event)
+            validator.validate(event)
         except ValidationError as e:
             path = ".".join(map(str, e.absolute_path)) or "<root>"
             raise ValueError(f"Schema validation failed at {path}: {e.message}")
+        return event_key
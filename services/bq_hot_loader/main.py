@@ -1,6 +1,5 @@
 # services/bq_hot_loader/main.py
-import threading
-import json
+import asyncio
 import os
 from typing import Optional
 from fastapi import FastAPI
@@ -10,18 +9,23 @@ from app.subscriber import PubSubSubscriber
 
 app = FastAPI()
 _subscriber: Optional[PubSubSubscriber] = None
-_worker: Optional[threading.Thread] = None
+_listener_task: Optional[asyncio.Task] = None
 
 @app.on_event("startup")
-def _startup():
-    global _subscriber, _worker
-    app.logger if hasattr(app, "logger") else None
-    print("[bq-hot-loader] startup: creating PubSubSubscriber and background thread...")
+async def _startup():
+    global _subscriber, _listener_task
+    print("[bq-hot-loader] startup: creating PubSubSubscriber on the event loop...")
     if _subscriber is None:
         _subscriber = PubSubSubscriber()
-        _worker = threading.Thread(target=_subscriber.listen, daemon=True, name="pubsub-listener")
-        _worker.start()
-        print("[bq-hot-loader] background listener thread started.")
+        # The async pull loop shares the uvicorn event loop, so health checks
+        # and the subscriber don't compete across threads for the GIL.
+        _listener_task = asyncio.create_task(_subscriber.listen_async())
+        print("[bq-hot-loader] async listener task started.")
+
+@app.on_event("shutdown")
+async def _shutdown():
+    if _listener_task is not None:
+        _listener_task.cancel()
 
 @app.get("/")
 def root():
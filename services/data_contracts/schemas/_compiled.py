@@ -0,0 +1,355 @@
+"""Compiled schema contracts.
+
+GENERATED by tools/build_schema_module.py -- do not edit by hand.
+Regenerate after any contract change:
+
+    python tools/build_schema_module.py
+"""
+
+ENVELOPE = {'$id': 'https://relay-spec.example/schemas/event-envelope.schema.json',
+ '$schema': 'https://json-schema.org/draft/2020-12/schema',
+ 'title': 'EventEnvelope',
+ 'type': 'object',
+ 'properties': {'schema_version': {'type': 'string', 'pattern': '^1\\.\\d+\\.\\d+$'},
+                'event_version': {'type': 'string', 'pattern': '^1\\.\\d+\\.\\d+$'},
+                'event_id': {'type': 'string', 'format': 'uuid'},
+                'parcel_id': {'type': 'string', 'format': 'uuid'},
+                'event_type': {'type': 'string',
+                               'enum': ['PARCEL_CREATED',
+                                        'SCAN_IN_DEPOT',
+                                        'SCAN_OUT_DEPOT',
+                                        'LOADED_TO_VAN',
+                                        'OUT_FOR_DELIVERY',
+                                        'ETA_SET',
+                                        'ETA_UPDATED',
+                                        'DELIVERED',
+                                        'EXCEPTION']},
+                'event_ts': {'type': 'string', 'format': 'date-time'},
+                'producer': {'type': 'string', 'minLength': 1},
+                'sequence_no': {'type': 'integer', 'minimum': 0},
+                'trace_id': {'type': 'string'}},
+ 'required': ['schema_version',
+              'event_version',
+              'event_id',
+              'parcel_id',
+              'event_type',
+              'event_ts',
+              'producer',
+              'sequence_no']}
+
+EVENTS = {
+    'https://relay-spec.example/schemas/events/delivered.schema.json':
+        {'$id': 'https://relay-spec.example/schemas/events/delivered.schema.json',
+         '$schema': 'https://json-schema.org/draft/2020-12/schema',
+         'title': 'Delivered',
+         'type': 'object',
+         'allOf': [{'$ref': 'https://relay-spec.example/schemas/event-envelope.schema.json'},
+                   {'type': 'object',
+                    'additionalProperties': False,
+                    'properties': {'schema_version': {'type': 'string', 'pattern': '^1\\.\\d+\\.\\d+$'},
+                                   'event_version': {'type': 'string', 'pattern': '^1\\.\\d+\\.\\d+$'},
+                                   'event_id': {'type': 'string', 'format': 'uuid'},
+                                   'parcel_id': {'type': 'string', 'format': 'uuid'},
+                                   'event_type': {'const': 'DELIVERED'},
+                                   'event_ts': {'type': 'string', 'format': 'date-time'},
+                                   'producer': {'type': 'string', 'minLength': 1},
+                                   'sequence_no': {'type': 'integer', 'minimum': 0},
+                                   'trace_id': {'type': 'string'},
+                                   'delivered_ts': {'type': 'string', 'format': 'date-time'},
+                                   'attempt_number': {'type': 'integer', 'minimum': 1},
+                                   'outcome': {'type': 'string',
+                                               'enum': ['SUCCESS', 'CARDED', 'FAILED', 'RETURNED']},
+                                   'failure_reason': {'type': 'string'},
+                                   'route_id': {'type': 'string', 'format': 'uuid'},
+                                   'courier_id': {'type': 'string', 'format': 'uuid'}},
+                    'required': ['schema_version',
+                                 'event_version',
+                                 'event_id',
+                                 'parcel_id',
+                                 'event_type',
+                                 'event_ts',
+                                 'producer',
+                                 'sequence_no',
+                                 'delivered_ts',
+                                 'attempt_number',
+                                 'outcome']}]},
+    'https://relay-spec.example/schemas/events/eta-set.schema.json':
+        {'$id': 'https://relay-spec.example/schemas/events/eta-set.schema.json',
+         '$schema': 'https://json-schema.org/draft/2020-12/schema',
+         'title': 'EtaSet',
+         'type': 'object',
+         'allOf': [{'$ref': 'https://relay-spec.example/schemas/event-envelope.schema.json'},
+                   {'type': 'object',
+                    'additionalProperties': False,
+                    'properties': {'schema_version': {'type': 'string', 'pattern': '^1\\.\\d+\\.\\d+$'},
+                                   'event_version': {'type': 'string', 'pattern': '^1\\.\\d+\\.\\d+$'},
+                                   'event_id': {'type': 'string', 'format': 'uuid'},
+                                   'parcel_id': {'type': 'string', 'format': 'uuid'},
+                                   'event_type': {'const': 'ETA_SET'},
+                                   'event_ts': {'type': 'string', 'format': 'date-time'},
+                                   'producer': {'type': 'string', 'minLength': 1},
+                                   'sequence_no': {'type': 'integer', 'minimum': 0},
+                                   'trace_id': {'type': 'string'},
+                                   'route_id': {'type': 'string', 'format': 'uuid'},
+                                   'predicted_delivery_ts': {'type': 'string', 'format': 'date-time'},
+                                   'generated_ts': {'type': 'string', 'format': 'date-time'},
+                                   'source': {'type': 'string',
+                                              'enum': ['PLANNER', 'RECOMPUTE', 'MANUAL']}},
+                    'required': ['schema_version',
+                                 'event_version',
+                                 'event_id',
+                                 'parcel_id',
+                                 'event_type',
+                                 'event_ts',
+                                 'producer',
+                                 'sequence_no',
+                                 'route_id',
+                                 'predicted_delivery_ts',
+                                 'generated_ts',
+                                 'source']}]},
+    'https://relay-spec.example/schemas/events/eta-updated.schema.json':
+        {'$id': 'https://relay-spec.example/schemas/events/eta-updated.schema.json',
+         '$schema': 'https://json-schema.org/draft/2020-12/schema',
+         'title': 'EtaUpdated',
+         'type': 'object',
+         'allOf': [{'$ref': 'https://relay-spec.example/schemas/event-envelope.schema.json'},
+                   {'type': 'object',
+                    'additionalProperties': False,
+                    'properties': {'schema_version': {'type': 'string', 'pattern': '^1\\.\\d+\\.\\d+$'},
+                                   'event_version': {'type': 'string', 'pattern': '^1\\.\\d+\\.\\d+$'},
+                                   'event_id': {'type': 'string', 'format': 'uuid'},
+                                   'parcel_id': {'type': 'string', 'format': 'uuid'},
+                                   'event_type': {'const': 'ETA_UPDATED'},
+                                   'event_ts': {'type': 'string', 'format': 'date-time'},
+                                   'producer': {'type': 'string', 'minLength': 1},
+                                   'sequence_no': {'type': 'integer', 'minimum': 0},
+                                   'trace_id': {'type': 'string'},
+                                   'route_id': {'type': 'string', 'format': 'uuid'},
+                                   'predicted_delivery_ts': {'type': 'string', 'format': 'date-time'},
+                                   'generated_ts': {'type': 'string', 'format': 'date-time'},
+                                   'source': {'type': 'string',
+                                              'enum': ['PLANNER', 'RECOMPUTE', 'MANUAL']}},
+                    'required': ['schema_version',
+                                 'event_version',
+                                 'event_id',
+                                 'parcel_id',
+                                 'event_type',
+                                 'event_ts',
+                                 'producer',
+                                 'sequence_no',
+                                 'route_id',
+                                 'predicted_delivery_ts',
+                                 'generated_ts',
+                                 'source']}]},
+    'https://relay-spec.example/schemas/events/exception.schema.json':
+        {'$id': 'https://relay-spec.example/schemas/events/exception.schema.json',
+         '$schema': 'https://json-schema.org/draft/2020-12/schema',
+         'title': 'Exception',
+         'type': 'object',
+         'allOf': [{'$ref': 'https://relay-spec.example/schemas/event-envelope.schema.json'},
+                   {'type': 'object',
+                    'additionalProperties': False,
+                    'properties': {'schema_version': {'type': 'string', 'pattern': '^1\\.\\d+\\.\\d+$'},
+                                   'event_version': {'type': 'string', 'pattern': '^1\\.\\d+\\.\\d+$'},
+                                   'event_id': {'type': 'string', 'format': 'uuid'},
+                                   'parcel_id': {'type': 'string', 'format': 'uuid'},
+                                   'event_type': {'const': 'EXCEPTION'},
+                                   'event_ts': {'type': 'string', 'format': 'date-time'},
+                                   'producer': {'type': 'string', 'minLength': 1},
+                                   'sequence_no': {'type': 'integer', 'minimum': 0},
+                                   'trace_id': {'type': 'string'},
+                                   'exception_code': {'type': 'string',
+                                                      'enum': ['MISSORT',
+                                                               'ADDRESS_ISSUE',
+                                                               'DEPOT_CAPACITY',
+                                                               'VEHICLE_BREAKDOWN',
+                                                               'CUSTOMER_NOT_HOME']},
+                                   'stage_hint': {'type': 'string',
+                                                  'enum': ['FIRST_MILE', 'DEPOT', 'LINEHAUL', 'LAST_MILE']},
+                                   'details': {'type': 'string'}},
+                    'required': ['schema_version',
+                                 'event_version',
+                                 'event_id',
+                                 'parcel_id',
+                                 'event_type',
+                                 'event_ts',
+                                 'producer',
+                                 'sequence_no',
+                                 'exception_code']}]},
+    'https://relay-spec.example/schemas/events/loaded-to-van.schema.json':
+        {'$id': 'https://relay-spec.example/schemas/events/loaded-to-van.schema.json',
+         '$schema': 'https://json-schema.org/draft/2020-12/schema',
+         'title': 'LoadedToVan',
+         'type': 'object',
+         'allOf': [{'$ref': 'https://relay-spec.example/schemas/event-envelope.schema.json'},
+                   {'type': 'object',
+                    'additionalProperties': False,
+                    'properties': {'schema_version': {'type': 'string', 'pattern': '^1\\.\\d+\\.\\d+$'},
+                                   'event_version': {'type': 'string', 'pattern': '^1\\.\\d+\\.\\d+$'},
+                                   'event_id': {'type': 'string', 'format': 'uuid'},
+                                   'parcel_id': {'type': 'string', 'format': 'uuid'},
+                                   'event_type': {'const': 'LOADED_TO_VAN'},
+                                   'event_ts': {'type': 'string', 'format': 'date-time'},
+                                   'producer': {'type': 'string', 'minLength': 1},
+                                   'sequence_no': {'type': 'integer', 'minimum': 0},
+                                   'trace_id': {'type': 'string'},
+                                   'route_id': {'type': 'string', 'format': 'uuid'},
+                                   'courier_id': {'type': 'string', 'format': 'uuid'},
+                                   'planned_stop_seq': {'type': 'integer', 'minimum': 1}},
+                    'required': ['schema_version',
+                                 'event_version',
+                                 'event_id',
+                                 'parcel_id',
+                                 'event_type',
+                                 'event_ts',
+                                 'producer',
+                                 'sequence_no',
+                                 'route_id',
+                                 'courier_id']}]},
+    'https://relay-spec.example/schemas/events/out-for-delivery.schema.json':
+        {'$id': 'https://relay-spec.example/schemas/events/out-for-delivery.schema.json',
+         '$schema': 'https://json-schema.org/draft/2020-12/schema',
+         'title': 'OutForDelivery',
+         'type': 'object',
+         'allOf': [{'$ref': 'https://relay-spec.example/schemas/event-envelope.schema.json'},
+                   {'type': 'object',
+                    'additionalProperties': False,
+                    'properties': {'schema_version': {'type': 'string', 'pattern': '^1\\.\\d+\\.\\d+$'},
+                                   'event_version': {'type': 'string', 'pattern': '^1\\.\\d+\\.\\d+$'},
+                                   'event_id': {'type': 'string', 'format': 'uuid'},
+                                   'parcel_id': {'type': 'string', 'format': 'uuid'},
+                                   'event_type': {'const': 'OUT_FOR_DELIVERY'},
+                                   'event_ts': {'type': 'string', 'format': 'date-time'},
+                                   'producer': {'type': 'string', 'minLength': 1},
+                                   'sequence_no': {'type': 'integer', 'minimum': 0},
+                                   'trace_id': {'type': 'string'},
+                                   'route_id': {'type': 'string', 'format': 'uuid'},
+                                   'first_planned_eta_ts': {'type': 'string', 'format': 'date-time'}},
+                    'required': ['schema_version',
+                                 'event_version',
+                                 'event_id',
+                                 'parcel_id',
+                                 'event_type',
+                                 'event_ts',
+                                 'producer',
+                                 'sequence_no',
+                                 'route_id']}]},
+    'https://relay-spec.example/schemas/events/parcel-created.schema.json':
+        {'$id': 'https://relay-spec.example/schemas/events/parcel-created.schema.json',
+         '$schema': 'https://json-schema.org/draft/2020-12/schema',
+         'title': 'ParcelCreated',
+         'type': 'object',
+         'allOf': [{'$ref': 'https://relay-spec.example/schemas/event-envelope.schema.json'},
+                   {'type': 'object',
+                    'additionalProperties': False,
+                    'properties': {'schema_version': {'type': 'string', 'pattern': '^1\\.\\d+\\.\\d+$'},
+                                   'event_version': {'type': 'string', 'pattern': '^1\\.\\d+\\.\\d+$'},
+                                   'event_id': {'type': 'string', 'format': 'uuid'},
+                                   'parcel_id': {'type': 'string', 'format': 'uuid'},
+                                   'event_type': {'const': 'PARCEL_CREATED'},
+                                   'event_ts': {'type': 'string', 'format': 'date-time'},
+                                   'producer': {'type': 'string', 'minLength': 1},
+                                   'sequence_no': {'type': 'integer', 'minimum': 0},
+                                   'trace_id': {'type': 'string'},
+                                   'merchant_id': {'type': 'string', 'format': 'uuid'},
+                                   'origin_address_id': {'type': 'string', 'format': 'uuid'},
+                                   'destination_address_id': {'type': 'string', 'format': 'uuid'},
+                                   'service_tier': {'type': 'string',
+                                                    'enum': ['NEXT_DAY', 'TWO_DAY', 'ECONOMY']},
+                                   'created_ts': {'type': 'string', 'format': 'date-time'},
+                                   'promised_window_start': {'type': 'string', 'format': 'date-time'},
+                                   'promised_window_end': {'type': 'string', 'format': 'date-time'},
+                                   'weight_grams': {'type': 'integer', 'minimum': 0},
+                                   'volume_cm3': {'type': 'integer', 'minimum': 0}},
+                    'required': ['schema_version',
+                                 'event_version',
+                                 'event_id',
+                                 'parcel_id',
+                                 'event_type',
+                                 'event_ts',
+                                 'producer',
+                                 'sequence_no',
+                                 'merchant_id',
+                                 'origin_address_id',
+                                 'destination_address_id',
+                                 'service_tier',
+                                 'created_ts',
+                                 'promised_window_start',
+                                 'promised_window_end']}]},
+    'https://relay-spec.example/schemas/events/scan-in-depot.schema.json':
+        {'$id': 'https://relay-spec.example/schemas/events/scan-in-depot.schema.json',
+         '$schema': 'https://json-schema.org/draft/2020-12/schema',
+         'title': 'ScanInDepot',
+         'type': 'object',
+         'allOf': [{'$ref': 'https://relay-spec.example/schemas/event-envelope.schema.json'},
+                   {'type': 'object',
+                    'additionalProperties': False,
+                    'properties': {'schema_version': {'type': 'string', 'pattern': '^1\\.\\d+\\.\\d+$'},
+                                   'event_version': {'type': 'string', 'pattern': '^1\\.\\d+\\.\\d+$'},
+                                   'event_id': {'type': 'string', 'format': 'uuid'},
+                                   'parcel_id': {'type': 'string', 'format': 'uuid'},
+                                   'event_type': {'const': 'SCAN_IN_DEPOT'},
+                                   'event_ts': {'type': 'string', 'format': 'date-time'},
+                                   'producer': {'type': 'string', 'minLength': 1},
+                                   'sequence_no': {'type': 'integer', 'minimum': 0},
+                                   'trace_id': {'type': 'string'},
+                                   'depot_id': {'type': 'string', 'format': 'uuid'},
+                                   'scanner_id': {'type': 'string'},
+                                   'area_code': {'type': 'string'},
+                                   'belt_no': {'type': 'integer', 'minimum': 1}},
+                    'required': ['schema_version',
+                                 'event_version',
+                                 'event_id',
+                                 'parcel_id',
+                                 'event_type',
+                                 'event_ts',
+                                 'producer',
+                                 'sequence_no',
+                                 'depot_id',
+                                 'scanner_id',
+                                 'area_code']}]},
+    'https://relay-spec.example/schemas/events/scan-out-depot.schema.json':
+        {'$id': 'https://relay-spec.example/schemas/events/scan-out-depot.schema.json',
+         '$schema': 'https://json-schema.org/draft/2020-12/schema',
+         'title': 'ScanOutDepot',
+         'type': 'object',
+         'allOf': [{'$ref': 'https://relay-spec.example/schemas/event-envelope.schema.json'},
+                   {'type': 'object',
+                    'additionalProperties': False,
+                    'properties': {'schema_version': {'type': 'string', 'pattern': '^1\\.\\d+\\.\\d+$'},
+                                   'event_version': {'type': 'string', 'pattern': '^1\\.\\d+\\.\\d+$'},
+                                   'event_id': {'type': 'string', 'format': 'uuid'},
+                                   'parcel_id': {'type': 'string', 'format': 'uuid'},
+                                   'event_type': {'const': 'SCAN_OUT_DEPOT'},
+                                   'event_ts': {'type': 'string', 'format': 'date-time'},
+                                   'producer': {'type': 'string', 'minLength': 1},
+                                   'sequence_no': {'type': 'integer', 'minimum': 0},
+                                   'trace_id': {'type': 'string'},
+                                   'depot_id': {'type': 'string', 'format': 'uuid'},
+                                   'scanner_id': {'type': 'string'},
+                                   'area_code': {'type': 'string'},
+                                   'belt_no': {'type': 'integer', 'minimum': 1}},
+                    'required': ['schema_version',
+                                 'event_version',
+                                 'event_id',
+                                 'parcel_id',
+                                 'event_type',
+                                 'event_ts',
+                                 'producer',
+                                 'sequence_no',
+                                 'depot_id',
+                                 'scanner_id',
+                                 'area_code']}]},
+}
+
+ALLOWED_FIELDS = {
+    'DELIVERED': frozenset(['attempt_number', 'courier_id', 'delivered_ts', 'event_id', 'event_ts', 'event_type', 'event_version', 'failure_reason', 'outcome', 'parcel_id', 'producer', 'route_id', 'schema_version', 'sequence_no', 'trace_id']),
+    'ETA_SET': frozenset(['event_id', 'event_ts', 'event_type', 'event_version', 'generated_ts', 'parcel_id', 'predicted_delivery_ts', 'producer', 'route_id', 'schema_version', 'sequence_no', 'source', 'trace_id']),
+    'ETA_UPDATED': frozenset(['event_id', 'event_ts', 'event_type', 'event_version', 'generated_ts', 'parcel_id', 'predicted_delivery_ts', 'producer', 'route_id', 'schema_version', 'sequence_no', 'source', 'trace_id']),
+    'EXCEPTION': frozenset(['details', 'event_id', 'event_ts', 'event_type', 'event_version', 'exception_code', 'parcel_id', 'producer', 'schema_version', 'sequence_no', 'stage_hint', 'trace_id']),
+    'LOADED_TO_VAN': frozenset(['courier_id', 'event_id', 'event_ts', 'event_type', 'event_version', 'parcel_id', 'planned_stop_seq', 'producer', 'route_id', 'schema_version', 'sequence_no', 'trace_id']),
+    'OUT_FOR_DELIVERY': frozenset(['event_id', 'event_ts', 'event_type', 'event_version', 'first_planned_eta_ts', 'parcel_id', 'producer', 'route_id', 'schema_version', 'sequence_no', 'trace_id']),
+    'PARCEL_CREATED': frozenset(['created_ts', 'destination_address_id', 'event_id', 'event_ts', 'event_type', 'event_version', 'merchant_id', 'origin_address_id', 'parcel_id', 'producer', 'promised_window_end', 'promised_window_start', 'schema_version', 'sequence_no', 'service_tier', 'trace_id', 'volume_cm3', 'weight_grams']),
+    'SCAN_IN_DEPOT': frozenset(['area_code', 'belt_no', 'depot_id', 'event_id', 'event_ts', 'event_type', 'event_version', 'parcel_id', 'producer', 'scanner_id', 'schema_version', 'sequence_no', 'trace_id']),
+    'SCAN_OUT_DEPOT': frozenset(['area_code', 'belt_no', 'depot_id', 'event_id', 'event_ts', 'event_type', 'event_version', 'parcel_id', 'producer', 'scanner_id', 'schema_version', 'sequence_no', 'trace_id']),
+}
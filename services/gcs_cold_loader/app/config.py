@@ -3,6 +3,9 @@ import os
 PROJECT_ID = os.environ.get("PROJECT_ID", "relay-analytics-demo")
 SUBSCRIPTION_ID = os.environ.get("SUBSCRIPTION_ID", "sub-cold-gcs")
 BUCKET_NAME = os.environ.get("BUCKET_NAME", "relay-cold-storage")
+# Escape hatch: force the interpretive jsonschema validators instead of the
+# codegen'd fastjsonschema ones.
+USE_JSONSCHEMA_FALLBACK = os.environ.get("USE_JSONSCHEMA_FALLBACK", "").lower() in ("1", "true", "yes")
 SCHEMA_DIR = os.path.join(
     os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
     "data_contracts", "schemas"
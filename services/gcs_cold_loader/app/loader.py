@@ -1,20 +1,27 @@
 # services/gcs_cold_loader/app/loader.py
+import gzip
 import io
-import json
 import os
+import threading
+import time
+import uuid
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Dict, List, Any, Tuple
 
+import ciso8601
 import fastavro
+import orjson
+import requests.adapters
 from google.cloud import storage
+from google.cloud.storage.retry import DEFAULT_RETRY
 
 from app import config
 
 # Helpers
 
 def _load_json(path: str) -> Dict[str, Any]:
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return orjson.loads(Path(path).read_bytes())
 
 def _strip_schema_suffix(name: str) -> str:
     # delivered.schema.json -> delivered
@@ -47,10 +54,64 @@ def _is_timestamp_prop(prop_schema: Dict[str, Any], name: str) -> bool:
     # heuristic fallback
     return name.endswith("_ts")
 
+def _days_from_civil(y: int, m: int, d: int) -> int:
+    # Howard Hinnant's civil-to-days algorithm: days since 1970-01-01.
+    y -= m <= 2
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * (m + (-3 if m > 2 else 9)) + 2) // 5 + d - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
 def _to_micros(rfc3339: str) -> int:
-    # Accept Z or +00:00, etc.
-    dt = datetime.fromisoformat(rfc3339.replace("Z", "+00:00"))
-    return int(dt.timestamp() * 1_000_000)
+    # Fast path for the fixed second-precision layout YYYY-MM-DDTHH:MM:SSZ:
+    # pure integer arithmetic, no datetime object at all.
+    if len(rfc3339) == 20 and rfc3339[-1] == "Z":
+        days = _days_from_civil(int(rfc3339[0:4]), int(rfc3339[5:7]), int(rfc3339[8:10]))
+        secs = (days * 86400
+                + int(rfc3339[11:13]) * 3600
+                + int(rfc3339[14:16]) * 60
+                + int(rfc3339[17:19]))
+        return secs * 1_000_000
+
+    # General RFC3339 (fractional seconds, offsets): ciso8601's C parser.
+    dt = ciso8601.parse_rfc3339(rfc3339)
+    return int(dt.timestamp()) * 1_000_000 + dt.microsecond
+
+def _conv_ts(value: Any) -> Any:
+    if isinstance(value, str) and value:
+        try:
+            return _to_micros(value)
+        except Exception:
+            # if it isn't parseable, store null rather than invalid
+            return None
+    return None
+
+def _conv_long(value: Any) -> Any:
+    try:
+        return int(value) if value is not None else None
+    except Exception:
+        return None
+
+def _conv_double(value: Any) -> Any:
+    try:
+        return float(value) if value is not None else None
+    except Exception:
+        return None
+
+def _conv_bool(value: Any) -> Any:
+    return value if isinstance(value, bool) else None
+
+def _conv_string(value: Any) -> Any:
+    return None if value is None else str(value)
+
+_CONVERTERS = {
+    "long": _conv_long,
+    "double": _conv_double,
+    "boolean": _conv_bool,
+    "string": _conv_string,
+}
 
 def _avro_primitive_for_json_type(prop: Dict[str, Any]) -> str:
     t = prop.get("type")
@@ -65,6 +126,23 @@ def _avro_primitive_for_json_type(prop: Dict[str, Any]) -> str:
 
 # Loader
 
+# Process-wide storage client: each construction spins up its own credential
+# refresh and HTTPS session, so per-instance clients re-handshake TCP/TLS on
+# every upload path. Lazy so importing the module needs no credentials.
+_CLIENT = None
+
+def _storage_client() -> storage.Client:
+    global _CLIENT
+    if _CLIENT is None:
+        client = storage.Client()
+        # Widen the HTTP connection pool so concurrent uploads reuse warm
+        # TLS sessions instead of re-handshaking per call.
+        adapter = requests.adapters.HTTPAdapter(pool_connections=32, pool_maxsize=32)
+        client._http.mount("https://", adapter)
+        _CLIENT = client
+    return _CLIENT
+
+
 class GCSAvroLoader:
     """
     Schema-aware AVRO writer for cold storage:
@@ -74,8 +152,16 @@ class GCSAvroLoader:
     - Adds any extra producer fields as nullable strings
     """
 
+    # Size trigger must stay below the subscriber's flow-control
+    # max_outstanding (acks for buffered messages are deferred until the
+    # flush), or buffers can never fill and every flush waits out the age
+    # timer. The age trigger is the latency/throughput bound when flow
+    # control is constrained, so it is kept tight.
+    BATCH_MAX_RECORDS = 1000
+    BATCH_MAX_AGE_SEC = 1.0
+
     def __init__(self):
-        self.client = storage.Client()
+        self.client = _storage_client()
         self.bucket = self.client.bucket(config.BUCKET_NAME)
 
         # Load envelope
@@ -105,24 +191,57 @@ class GCSAvroLoader:
         loaded = ", ".join(sorted(self.contracts.keys()))
         print(f"[GCSAvroLoader] Loaded {len(self.contracts)} event contracts: {loaded}")
 
+        # fastavro re-parses a raw dict schema on every writer() call, and the
+        # contract-defined portion of the schema depends only on event_type.
+        # Parse each one once here; schemas extended with extra producer
+        # fields are parsed on first sight and cached by extras signature.
+        self._contract_keys: Dict[str, frozenset] = {}
+        self._avro_parsed: Dict[str, Any] = {}
+        for key, contract in self.contracts.items():
+            self._contract_keys[key] = frozenset(
+                _merge_contract_props(self.envelope, contract).keys()
+            )
+            self._avro_parsed[key] = fastavro.parse_schema(
+                self._build_avro_schema_for_contract(key)
+            )
+        self._extras_parsed: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Any] = {}
+
+        # Specialize normalization per event type: the schema is fixed, so the
+        # union/logicalType dispatch in _normalize_for_avro can be resolved
+        # once here into a flat (field name, converter) list.
+        self._normalizers: Dict[str, List[Tuple[str, Any]]] = {
+            key: self._compile_normalizer(key) for key in self.contracts
+        }
+
+        # Per-(event_type, hour) record buffers. One small AVRO object per
+        # event carries far more framing overhead than payload and each GCS
+        # write is billed per op, so records accumulate until a size or age
+        # threshold and flush as one Snappy-compressed container file.
+        self._buffers: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._buffers_lock = threading.Lock()
+        # Reused per-thread scratch buffer for one-record uploads; avoids a
+        # fresh BytesIO (and its small-buffer growth) per call.
+        self._local = threading.local()
+        self._flusher = threading.Thread(
+            target=self._flush_stale_loop, daemon=True, name="gcs-avro-flusher"
+        )
+        self._flusher.start()
+
     # Schema composition (AVRO)
 
-    def _build_avro_schema_for_event(self, event: Dict[str, Any]) -> Dict[str, Any]:
+    def _build_avro_schema_for_contract(self, key: str) -> Dict[str, Any]:
         """
-        Build an AVRO schema for this event by merging envelope + event-contract properties.
+        Build the AVRO schema for the contract-defined portion of an event type
+        by merging envelope + event-contract properties.
         Every field is nullable (["null", <type>]).
         Timestamps become long with logicalType=timestamp-micros.
-        Extra fields not in the contract become nullable strings.
         """
-        evt_type = (event.get("event_type") or "").upper()
-        contract = self.contracts.get(evt_type)
+        contract = self.contracts.get(key)
         if not contract:
-            raise ValueError(f"No event contract loaded for event_type={evt_type}")
+            raise ValueError(f"No event contract loaded for event_type={key}")
 
         all_props = _merge_contract_props(self.envelope, contract)
         fields: List[Dict[str, Any]] = []
-
-        # Contract-defined fields first
         for name, prop in all_props.items():
             if _is_timestamp_prop(prop, name):
                 avro_type = {"type": "long", "logicalType": "timestamp-micros"}
@@ -130,29 +249,60 @@ class GCSAvroLoader:
                 avro_type = _avro_primitive_for_json_type(prop)
             fields.append({"name": name, "type": ["null", avro_type]})
 
-        # Then any extra fields in the event (additive producer fields)
-        contract_keys = set(all_props.keys())
-        for name, value in event.items():
-            if name in contract_keys:
-                continue
-            # Heuristic: timestamps by suffix, else infer primitive from python type, else string
-            if isinstance(value, str) and name.endswith("_ts"):
-                fields.append({"name": name, "type": ["null", {"type": "long", "logicalType": "timestamp-micros"}]})
-            elif isinstance(value, bool):
-                fields.append({"name": name, "type": ["null", "boolean"]})
-            elif isinstance(value, int):
-                fields.append({"name": name, "type": ["null", "long"]})
-            elif isinstance(value, float):
-                fields.append({"name": name, "type": ["null", "double"]})
-            else:
-                fields.append({"name": name, "type": ["null", "string"]})
-
         return {
             "type": "record",
-            "name": f"{evt_type}_Event",
+            "name": f"{key}_Event",
             "fields": fields,
         }
 
+    @staticmethod
+    def _extra_avro_type(name: str, value: Any) -> Any:
+        # Heuristic: timestamps by suffix, else infer primitive from python type, else string
+        if isinstance(value, str) and name.endswith("_ts"):
+            return {"type": "long", "logicalType": "timestamp-micros"}
+        if isinstance(value, bool):
+            return "boolean"
+        if isinstance(value, int):
+            return "long"
+        if isinstance(value, float):
+            return "double"
+        return "string"
+
+    def _parsed_schema_for_event(self, key: str, event: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return the cached parsed schema for this event. The common case —
+        no producer fields beyond the contract — hits the per-event-type
+        cache; events with extras are cached per (key, extras signature).
+        """
+        contract_keys = self._contract_keys[key]
+        extras = [(name, self._extra_avro_type(name, value))
+                  for name, value in event.items() if name not in contract_keys]
+        if not extras:
+            return self._avro_parsed[key]
+
+        sig = tuple(sorted((name, str(avro_type)) for name, avro_type in extras))
+        parsed = self._extras_parsed.get((key, sig))
+        if parsed is None:
+            schema = self._build_avro_schema_for_contract(key)
+            schema["fields"].extend(
+                {"name": name, "type": ["null", avro_type]} for name, avro_type in extras
+            )
+            parsed = fastavro.parse_schema(schema)
+            self._extras_parsed[(key, sig)] = parsed
+        return parsed
+
+    def _compile_normalizer(self, key: str) -> List[Tuple[str, Any]]:
+        """Resolve each field's union once into a (name, converter) pair."""
+        pairs: List[Tuple[str, Any]] = []
+        for fdef in self._avro_parsed[key].get("fields", []):
+            non_null = next((t for t in fdef["type"] if t != "null"), "string")
+            if isinstance(non_null, dict) and non_null.get("logicalType") == "timestamp-micros":
+                conv = _conv_ts
+            else:
+                conv = _CONVERTERS.get(non_null, _conv_string)
+            pairs.append((fdef["name"], conv))
+        return pairs
+
     # Event normalization for AVRO
 
     def _normalize_for_avro(self, event: Dict[str, Any], avro_schema: Dict[str, Any]) -> Dict[str, Any]:
@@ -206,28 +356,143 @@ class GCSAvroLoader:
 
     # Public API 
 
-    def upload_event(self, event: Dict[str, Any]) -> str:
+    def upload_event(self, event: Dict[str, Any], on_done=None, hour_prefix: str = None) -> str:
+        """
+        Buffer (or upload) one event. ``on_done`` is called with True once the
+        GCS write containing the event has succeeded, or False if its batch
+        failed to flush — callers use it to defer the Pub/Sub ack until the
+        bytes are durable rather than acking on buffer admission.
+        ``hour_prefix`` (YYYY/MM/DD/HH) may be supplied by callers that batch
+        many events, saving a datetime allocation + strftime per record.
+        """
         evt_type = event.get("event_type")
         if not evt_type:
             raise ValueError("Event missing event_type")
+        key = (evt_type or "").upper()
+
+        if hour_prefix is None:
+            hour_prefix = f"{datetime.now(timezone.utc):%Y/%m/%d/%H}"
+
+        # Look up (or build once) the parsed AVRO schema for this event shape
+        avro_schema = self._parsed_schema_for_event(key, event)
+
+        # Events carrying extra producer fields don't share the contract
+        # schema, so they keep the generic normalizer and the
+        # one-object-per-event path.
+        if avro_schema is not self._avro_parsed[key]:
+            row = self._normalize_for_avro(event, avro_schema)
+            path = self._upload_single(key, row, avro_schema, hour_prefix)
+            if on_done is not None:
+                on_done(True)
+            return path
+
+        # Contract-shaped event: one tight loop over precompiled converters.
+        row = {name: conv(event.get(name)) for name, conv in self._normalizers[key]}
+
+        bucket_key = (key, hour_prefix)
+
+        to_flush = None
+        with self._buffers_lock:
+            pending = self._buffers.get(bucket_key)
+            if pending is None:
+                pending = {"records": [], "callbacks": [], "created": time.monotonic()}
+                self._buffers[bucket_key] = pending
+            pending["records"].append(row)
+            if on_done is not None:
+                pending["callbacks"].append(on_done)
+            if len(pending["records"]) >= self.BATCH_MAX_RECORDS:
+                to_flush = self._buffers.pop(bucket_key)
+
+        if to_flush is not None:
+            return self._flush_buffer(bucket_key, to_flush)
+        return f"events/{hour_prefix}/{key}/"
+
+    def _flush_buffer(self, bucket_key: Tuple[str, str], pending: Dict[str, Any]) -> str:
+        try:
+            path = self._write_batch(bucket_key, pending["records"])
+        except Exception:
+            for cb in pending["callbacks"]:
+                cb(False)
+            raise
+        for cb in pending["callbacks"]:
+            cb(True)
+        return path
 
-        # Build AVRO schema for this event shape
-        avro_schema = self._build_avro_schema_for_event(event)
-
-        # Normalize one row per event
-        row = self._normalize_for_avro(event, avro_schema)
-
-        # Write AVRO to memory
-        buf = io.BytesIO()
-        fastavro.writer(buf, avro_schema, [row])
+    def _upload_single(self, key: str, row: Dict[str, Any], avro_schema: Dict[str, Any],
+                       hour_prefix: str) -> str:
+        # Path: events/YYYY/MM/DD/HH/<event_type>/<event_id>.avro
+        # A 1-record object-container file is mostly header and sync markers;
+        # schemaless_writer emits just the datum (readers resolve the schema
+        # by event_type, same as the batch files). The scratch BytesIO is
+        # per-thread and reused across calls.
+        buf = getattr(self._local, "buf", None)
+        if buf is None:
+            buf = self._local.buf = io.BytesIO()
         buf.seek(0)
+        buf.truncate()
+        fastavro.schemaless_writer(buf, avro_schema, row)
 
-        # Path: events/YYYY/MM/DD/HH/<event_type>/<event_id>.avro
-        now = datetime.now(timezone.utc)
         event_id = row.get("event_id") or "no-id"
-        path = f"events/{now:%Y/%m/%d/%H}/{evt_type}/{event_id}.avro"
+        path = f"events/{hour_prefix}/{key}/{event_id}.avro"
 
+        # Small one-shot object: hand over the materialized bytes directly
+        # rather than going through the stream read path. Avro datums gzip
+        # well, so compress on the wire unless the record is tiny enough that
+        # the gzip header would inflate it.
+        payload = buf.getvalue()
         blob = self.bucket.blob(path)
-        blob.upload_from_file(buf, content_type="application/avro")
+        if len(payload) >= 256:
+            blob.content_encoding = "gzip"
+            payload = gzip.compress(payload, 6)
+        # crc32c (C extension) instead of the default python MD5 — integrity
+        # stays server-verified but the client-side hash is no longer a CPU
+        # tax on this per-event path.
+        blob.upload_from_string(
+            payload, content_type="application/avro-binary",
+            checksum="crc32c", retry=DEFAULT_RETRY,
+        )
+
+        return path
+
+    def _write_batch(self, bucket_key: Tuple[str, str], records: List[Dict[str, Any]]) -> str:
+        key, hour_prefix = bucket_key
+        buf = io.BytesIO()
+        fastavro.writer(buf, self._avro_parsed[key], records, codec="snappy")
+        buf.seek(0)
 
+        path = f"events/{hour_prefix}/{key}/part-{uuid.uuid4()}.avro"
+        blob = self.bucket.blob(path)
+        blob.chunk_size = 8 * 1024 * 1024
+        blob.upload_from_file(
+            buf,
+            rewind=True,
+            size=buf.getbuffer().nbytes,
+            content_type="avro/binary",
+            checksum="crc32c",
+            retry=DEFAULT_RETRY,
+        )
+
+        print(f"[GCSAvroLoader] Flushed {len(records)} records to {path}")
         return path
+
+    def flush(self) -> List[str]:
+        """Force-write every pending buffer; returns the object paths written."""
+        with self._buffers_lock:
+            pending = list(self._buffers.items())
+            self._buffers.clear()
+        return [self._flush_buffer(k, b) for k, b in pending]
+
+    def _flush_stale_loop(self) -> None:
+        while True:
+            time.sleep(1.0)
+            now = time.monotonic()
+            stale = []
+            with self._buffers_lock:
+                for k in list(self._buffers):
+                    if now - self._buffers[k]["created"] >= self.BATCH_MAX_AGE_SEC:
+                        stale.append((k, self._buffers.pop(k)))
+            for k, b in stale:
+                try:
+                    self._flush_buffer(k, b)
+                except Exception as e:
+                    print(f"[GCSAvroLoader] Failed to flush batch {k}: {e}")
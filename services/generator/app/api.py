@@ -10,7 +10,7 @@ to preserve per-parcel ordering on the Pub/Sub topic.
 
 Key responsibilities:
 - Load runtime configuration (rate, distributions, toggles) from YAML + env.
-- Build lifecycles via `generate_parcel_lifecycle(...)` (strictly increasing timestamps).
+- Build lifecycles via `generate_parcel_batch(...)` (strictly increasing timestamps).
 - Validate every event against the envelope and type-specific JSON Schemas.
 - Publish to Pub/Sub using attributes (event_type, schema_version, event_version).
 
@@ -19,8 +19,9 @@ Endpoints:
 - POST /generate?eps=<int>&minutes=<int>
 """
 
+import asyncio
+import logging
 import os
-import time
 from typing import List, Dict, Any
 
 from fastapi import FastAPI, Query, HTTPException
@@ -28,8 +29,10 @@ from fastapi import FastAPI, Query, HTTPException
 from .config import load_config
 from .schemas import SchemaRegistry
 from .utils import utcnow, poisson_knuth, exponential_gaps
-from .generator import generate_parcel_lifecycle
-from .publisher import PubSubPublisher
+from .generator import generate_parcel_batch
+from .publisher import get_publisher
+
+logger = logging.getLogger("generator.api")
 
 
 def create_app() -> FastAPI:
@@ -50,6 +53,8 @@ def create_app() -> FastAPI:
         * GEN_EVENTS_PER_SEC -> overrides rate.events_per_sec in config (optional)
         * PUBSUB_TOPIC       -> overrides cfg.pubsub.topic (optional)
         * PROJECT_ID         -> GCP project for Pub/Sub (default: "relay-analytics-demo")
+        * VALIDATE_EVENTS    -> "0"/"false" disables schema validation (default: on)
+        * VALIDATE_SAMPLE_RATE -> validate only this fraction of events (default: 1.0)
     """
     app = FastAPI(title="Relay Generator", version="1.0.0")
 
@@ -64,12 +69,25 @@ def create_app() -> FastAPI:
     cfg = load_config(os.path.abspath(CONFIG_DIR))
 
     # Prepare a schema registry that validates the envelope and event-type schemas.
-    registry = SchemaRegistry(os.path.abspath(SCHEMA_DIR))
-
-    # Pub/Sub publisher
+    # VALIDATE_EVENTS=0 disables validation outright; VALIDATE_SAMPLE_RATE
+    # spot-checks a fraction of events (e.g. 0.01 in production).
+    registry = SchemaRegistry(
+        os.path.abspath(SCHEMA_DIR),
+        validate_events=os.getenv("VALIDATE_EVENTS", "1") not in ("0", "false"),
+        sample_rate=float(os.getenv("VALIDATE_SAMPLE_RATE", "1.0")),
+    )
+
+    # Pub/Sub publisher: per-process singleton whose gRPC client is created
+    # lazily on first publish, so importing/health-checking the app costs
+    # no channel setup.
     project_id = os.getenv("PROJECT_ID", "relay-analytics-demo")
     topic = os.getenv("TOPIC", cfg["pubsub"]["topic"])
-    publisher = PubSubPublisher(project_id, topic)
+    publisher = get_publisher(project_id, topic)
+
+    @app.on_event("shutdown")
+    def shutdown_publisher() -> None:
+        """Flush pending publishes and stop the client's batcher threads."""
+        publisher.close()
 
     @app.get("/health")
     def health():
@@ -83,7 +101,7 @@ def create_app() -> FastAPI:
         return {"ok": True, "topic": topic, "project_id": project_id}
 
     @app.post("/generate")
-    def generate(
+    async def generate(
         eps: int = Query(
             40,
             ge=1,
@@ -124,32 +142,38 @@ def create_app() -> FastAPI:
         Notes
         - Per-second jitter: we space out starts using exponential inter-arrival gaps to avoid bursts.
         - Validation: any schema violation would raise, halting the request with 422/500 depending on origin.
-        - Backpressure: Pub/Sub client calls are awaited (future.result()) in the publisher class to ensure
-          publish ordering guarantees hold and transient errors raise immediately in this demo service.
+        - Backpressure: publish futures are collected and settled once per tick; per-parcel
+          ordering holds via ordering_key, and transient errors still fail the request promptly.
+        - Concurrency: the endpoint is async — pacing uses `asyncio.sleep` and the blocking
+          publish runs in the default executor, so a long run doesn't pin a request worker.
         """
         # Basic guardrail: extremely large requests are likely misconfigurations.
         if eps * minutes > 2000 * 10:  # soft sanity threshold
             pass
 
-        end_time = time.time() + (minutes * 60)
+        loop = asyncio.get_running_loop()
+        end_time = loop.time() + (minutes * 60)
 
-        while time.time() < end_time:
+        while loop.time() < end_time:
             # Draw how many **lifecycles** to create this tick (Poisson with mean = eps).
             lam = float(eps)
             k = poisson_knuth(lam)
 
-            # Build K lifecycles and pre-validate their events against JSON Schemas.
-            lifecycles: List[List[Dict[str, Any]]] = []
+            # Build K lifecycles in one batch — all randomness for the tick
+            # is drawn as arrays up front, which is where the vectorized
+            # path pays off (batch-of-1 calls would re-pay the array setup
+            # per parcel) — then pre-validate against the JSON Schemas.
             base_now = utcnow()
-            for _ in range(max(0, k)):
-                lifecycle = generate_parcel_lifecycle(base_now, cfg)
+            lifecycles: List[List[Dict[str, Any]]] = (
+                generate_parcel_batch(base_now, cfg, max(0, k)))
 
-                # Validate every event before publish to fail-fast on contract drift.
+            # Validate every event before publish to fail-fast on contract drift.
+            # Full-event dumps were the dominant cost of this loop; the
+            # lazy %s only formats when DEBUG logging is actually on.
+            for lifecycle in lifecycles:
                 for evt in lifecycle:
-                    import json
-                    print(json.dumps(evt, indent=2))
+                    logger.debug("event %s", evt["event_id"])
                     registry.validate(evt)
-                lifecycles.append(lifecycle)
 
             # Spread lifecycle starts within the current second using exponential gaps
             # (mean 1/eps seconds). This keeps the stream closer to a Poisson process.
@@ -157,15 +181,24 @@ def create_app() -> FastAPI:
 
             # Publish all events; we stagger lifecycles with tiny sleeps to reduce bursts,
             # but maintain strict per-parcel event order by publishing lifecycle events sequentially.
+            # publish() is non-blocking; the client's internal batcher
+            # coalesces messages and the publisher tracks the futures.
+            # One flush() per tick settles them all, so transient errors
+            # still fail the request promptly.
+            published = 0
             for idx, lifecycle in enumerate(lifecycles):
                 if idx < len(gaps):
                     # Keep sleeps short so the request remains responsive in Cloud Run.
-                    time.sleep(min(gaps[idx], 0.5))
+                    await asyncio.sleep(min(gaps[idx], 0.5))
                 for evt in lifecycle:
                     publisher.publish(evt)
+                    published += 1
+
+            if published:
+                await loop.run_in_executor(None, publisher.flush)
 
             # Small sleep to cap loop frequency; the Poisson timing already introduces variability.
-            time.sleep(0.25)
+            await asyncio.sleep(0.25)
 
         return {"status": "ok", "eps": eps, "minutes": minutes}
 
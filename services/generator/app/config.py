@@ -1,15 +1,40 @@
+import functools
 import os
 from typing import Any, Dict
 import yaml
 
+try:
+    # libyaml C bindings: same semantics as SafeLoader, ~3x faster parse.
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 APP_ENV_VAR = "GENERATOR_ENV"
 
+
+@functools.lru_cache(maxsize=8)
+def _load_yaml_cached(path: str) -> Dict[str, Any]:
+    """Parse one YAML file, memoized per path for the process lifetime.
+
+    Env-var overrides are applied by load_config per call, so only the
+    disk-read + parse is cached here. Callers must not mutate the result.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return yaml.load(f, Loader=_YamlLoader) or {}
+
 def _merge_dict(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
-    """Shallow merge: values in b override a. Dict values are merged shallowly."""
+    """Recursive merge: values in b override a at any depth.
+
+    Pure — neither input is mutated, and new dicts are created only along
+    paths where the overlay collides with the base. That keeps the cached
+    base configs from _load_yaml_cached safe to reuse without deep-copying.
+    """
     out = dict(a)
     for k, v in (b or {}).items():
         if isinstance(v, dict) and isinstance(out.get(k), dict):
-            out[k].update(v)
+            out[k] = _merge_dict(out[k], v)
         else:
             out[k] = v
     return out
@@ -17,24 +42,21 @@ def _merge_dict(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
 def load_config(config_dir: str) -> Dict[str, Any]:
     env = os.getenv(APP_ENV_VAR, "dev")
 
-    with open(os.path.join(config_dir, "default.yaml"), "r") as f:
-        base = yaml.safe_load(f) or {}
+    base = _load_yaml_cached(os.path.join(config_dir, "default.yaml"))
+    env_cfg = _load_yaml_cached(os.path.join(config_dir, f"{env}.yaml"))
 
-    env_path = os.path.join(config_dir, f"{env}.yaml")
-    if os.path.exists(env_path):
-        with open(env_path, "r") as f:
-            env_cfg = yaml.safe_load(f) or {}
-        cfg = _merge_dict(base, env_cfg)
-    else:
-        cfg = base
+    # Always merge (even with an empty overlay) so callers get a copy rather
+    # than the cached dict itself.
+    cfg = _merge_dict(base, env_cfg)
 
-    # Env var overrides (optional)
+    # Env var overrides (optional). Replace the nested dicts instead of
+    # mutating them — the originals may be shared with the cached base.
     eps_env = os.getenv("GEN_EVENTS_PER_SEC")
     if eps_env:
-        cfg.setdefault("rate", {})["events_per_sec"] = int(eps_env)
+        cfg["rate"] = {**cfg.get("rate", {}), "events_per_sec": int(eps_env)}
 
     topic_env = os.getenv("PUBSUB_TOPIC")
     if topic_env:
-        cfg.setdefault("pubsub", {})["topic"] = topic_env
+        cfg["pubsub"] = {**cfg.get("pubsub", {}), "topic": topic_env}
 
     return cfg
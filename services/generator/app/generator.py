@@ -21,41 +21,47 @@ Repo assumptions for schema paths (relative to this file):
 """
 
 import os
-import json
-import random
+from concurrent.futures import ProcessPoolExecutor
 from datetime import timedelta, datetime, timezone
 from typing import Dict, Any, List, Set
 
-from jsonschema import RefResolver
+import numpy as np
+import orjson
 
-from .utils import uuid4, rfc3339, clamp, deltas_minutes, normal_minutes
+from .utils import uuid4, uuid4_batch, rfc3339
+from .generator_core import compute_schedule
+from .schemas import load_compiled_schemas
 
 # ---------------------------------------------------------------------------
-# Static ID pools for deterministic lookups (seeded for reproducibility).
+# Static ID pools for deterministic lookups.
 # These act like "reference tables" of depot IDs, courier IDs, merchant IDs.
 # ---------------------------------------------------------------------------
-random.seed(42)
 DEPOTS = [uuid4() for _ in range(10)]
 COURIERS = [uuid4() for _ in range(300)]
 MERCHANTS = [uuid4() for _ in range(120)]
 
+# Root seed for every RNG stream this module hands out. The in-process
+# default generator derives from it, and workers get non-overlapping child
+# streams via spawn keys, so multi-worker runs stay reproducible without
+# sharing (and locking on) one generator.
+_SS = np.random.SeedSequence(42)
 
-def _choose(lst):
-    """Pick a random element from a list."""
-    return random.choice(lst)
+# One generator-wide RNG: every random quantity for a batch of parcels is
+# drawn up front as NumPy arrays (one vectorized call per quantity), so the
+# per-parcel assembly loop only indexes into precomputed arrays instead of
+# paying interpreter dispatch for ~30 random.* calls per parcel.
+_RNG = np.random.default_rng(_SS)
 
 
-def _service_tier() -> str:
+def make_worker_rng(worker_id: int) -> np.random.Generator:
     """
-    Assign a random service tier based on weighted probability.
-    60% → NEXT_DAY, 30% → TWO_DAY, 10% → ECONOMY.
+    Return a private Generator for ``worker_id``, derived from the root seed.
+
+    Spawn keys give each worker a statistically independent stream that is
+    stable across runs regardless of how many workers exist or in which
+    order they start.
     """
-    r = random.random()
-    if r < 0.6:
-        return "NEXT_DAY"
-    if r < 0.9:
-        return "TWO_DAY"
-    return "ECONOMY"
+    return np.random.default_rng(np.random.SeedSequence(42, spawn_key=(worker_id,)))
 
 
 # ---------------------------------------------------------------------------
@@ -69,6 +75,27 @@ _ENVELOPE_PROPS: Set[str] = set()
 # Absolute schema dir cache flag
 _SCHEMAS_LOADED = False
 
+# Parcel-invariant context keys a builder may offer for injection, in the
+# order they are written when allowed.
+_CONTEXT_KEYS = (
+    "route_id",
+    "depot_id",
+    "weight_grams",
+    "volume_cm3",
+    "area_code",
+    "belt_no",
+    "stage_hint",
+    "merchant_id",
+    "origin_address_id",
+    "destination_address_id",
+)
+
+# Per event_type: (injectable context keys, takes trace_id, takes
+# generated_ts). Computed once at schema load so emission iterates only the
+# keys the contract actually accepts instead of filtering all candidates.
+_INJECT_PLAN: Dict[str, tuple] = {}
+_DEFAULT_PLAN = ((), False, False)
+
 
 def _schema_dir_default() -> str:
     """
@@ -85,10 +112,31 @@ def _load_schemas_once(schema_dir: str) -> None:
     """
     Load the envelope and all event schemas once and build the allowed field sets.
     """
-    global _SCHEMAS_LOADED, _ENVELOPE_PROPS, _ALLOWED_FIELDS_CACHE
+    global _SCHEMAS_LOADED, _ENVELOPE_PROPS, _ALLOWED_FIELDS_CACHE, _DEFAULT_PLAN
     if _SCHEMAS_LOADED:
         return
 
+    # Prefer the pre-baked module from tools/build_schema_module.py: the
+    # allowed-field sets are already computed, so startup does no JSON
+    # parsing at all.
+    compiled = load_compiled_schemas(schema_dir)
+    if compiled is not None:
+        _ENVELOPE_PROPS = frozenset(compiled.ENVELOPE.get("properties", {}))
+        _DEFAULT_PLAN = (
+            tuple(k for k in _CONTEXT_KEYS if k in _ENVELOPE_PROPS),
+            "trace_id" in _ENVELOPE_PROPS,
+            "generated_ts" in _ENVELOPE_PROPS,
+        )
+        for event_type, allowed in compiled.ALLOWED_FIELDS.items():
+            _ALLOWED_FIELDS_CACHE[event_type] = frozenset(allowed)
+            _INJECT_PLAN[event_type] = (
+                tuple(k for k in _CONTEXT_KEYS if k in allowed),
+                "trace_id" in allowed,
+                "generated_ts" in allowed,
+            )
+        _SCHEMAS_LOADED = True
+        return
+
     envelope_path = os.path.join(schema_dir, "event-envelope.schema.json")
     events_dir = os.path.join(schema_dir, "events")
 
@@ -97,17 +145,14 @@ def _load_schemas_once(schema_dir: str) -> None:
     if not os.path.isdir(events_dir):
         raise FileNotFoundError(f"Events schema dir not found: {events_dir}")
 
-    with open(envelope_path, "r") as f:
-        envelope_schema = json.load(f)
-
-    _ENVELOPE_PROPS = set(envelope_schema.get("properties", {}).keys())
+    with open(envelope_path, "rb") as f:
+        envelope_schema = orjson.loads(f.read())
 
-    # Build a local resolver so $ref to the envelope URL resolves to this file (no network)
-    ENVELOPE_URL = "https://relay-spec.example/schemas/event-envelope.schema.json"
-    resolver = RefResolver(
-        base_uri=f"file://{schema_dir}/",
-        referrer=None,
-        store={ENVELOPE_URL: envelope_schema},
+    _ENVELOPE_PROPS = frozenset(envelope_schema.get("properties", {}).keys())
+    _DEFAULT_PLAN = (
+        tuple(k for k in _CONTEXT_KEYS if k in _ENVELOPE_PROPS),
+        "trace_id" in _ENVELOPE_PROPS,
+        "generated_ts" in _ENVELOPE_PROPS,
     )
 
     # For each event schema, merge envelope properties + event-specific properties
@@ -115,8 +160,8 @@ def _load_schemas_once(schema_dir: str) -> None:
         if not fname.endswith(".schema.json"):
             continue
         path = os.path.join(events_dir, fname)
-        with open(path, "r") as f:
-            schema = json.load(f)
+        with open(path, "rb") as f:
+            schema = orjson.loads(f.read())
 
         # Derive event_type from filename: 'parcel-created.schema.json' -> 'PARCEL_CREATED'
         stem = fname.replace(".schema.json", "")
@@ -130,7 +175,13 @@ def _load_schemas_once(schema_dir: str) -> None:
             for k in specific.get("properties", {}).keys():
                 allowed.add(k)
 
-        _ALLOWED_FIELDS_CACHE[event_type] = allowed
+        # Frozen: the hot path indexes this map directly per event
+        _ALLOWED_FIELDS_CACHE[event_type] = frozenset(allowed)
+        _INJECT_PLAN[event_type] = (
+            tuple(k for k in _CONTEXT_KEYS if k in allowed),
+            "trace_id" in allowed,
+            "generated_ts" in allowed,
+        )
 
     _SCHEMAS_LOADED = True
 
@@ -143,262 +194,320 @@ def _allowed_fields_for(event_type: str, schema_dir: str) -> Set[str]:
     return _ALLOWED_FIELDS_CACHE.get(event_type, set(_ENVELOPE_PROPS))
 
 
-def _inject_common_fields(evt: Dict[str, Any],
-                          allowed: Set[str],
-                          context: Dict[str, Any]) -> Dict[str, Any]:
+def _emit(seq: int,
+          evt: Dict[str, Any],
+          ts: str,
+          common_env: Dict[str, Any],
+          context: Dict[str, Any],
+          schema_dir: str,
+          new_id) -> Dict[str, Any]:
     """
-    Given an event payload, the set of allowed fields for its type, and a context
-    dict containing candidate common values (route_id, depot_id, etc.), copy in
-    fields **only if** allowed by schema and not already present in evt.
+    Assemble one event dict from its payload and sequence position.
+
+    Builds the full dict in a single spread (envelope template + per-event
+    ids + payload), then injects the schema-allowed common context via the
+    per-type plan precomputed at schema load. The two per-event context
+    values (trace_id, wall-clock generated_ts) are produced lazily here,
+    only for contracts that take them; everything else in ``context`` is
+    parcel-invariant.
     """
-    for k, v in context.items():
-        if k in allowed and (k not in evt or evt[k] is None):
-            evt[k] = v
-    return evt
+    keys, has_trace, has_generated = _INJECT_PLAN.get(
+        evt.get("event_type", "UNKNOWN"), _DEFAULT_PLAN)
+    e = {**common_env, "event_id": new_id(), "sequence_no": seq, **evt}
+    e["event_ts"] = ts
+    if has_trace and "trace_id" not in e:
+        e["trace_id"] = new_id()
+    if has_generated and "generated_ts" not in e:
+        e["generated_ts"] = rfc3339(datetime.now(timezone.utc))
+    for k in keys:
+        if k not in e or e[k] is None:
+            e[k] = context[k]
+    return e
 
 
 # ---------------------------------------------------------------------------
 # Main lifecycle generator
 # ---------------------------------------------------------------------------
 
-def generate_parcel_lifecycle(now_base: datetime,
-                              cfg: Dict[str, Any],
-                              schema_dir: str = None) -> List[Dict[str, Any]]:
+_STAGE_HINTS = ("FIRST_MILE", "DEPOT", "LINEHAUL", "LAST_MILE")
+
+# (tier, promised_window_start_hours, promised_window_end_hours), indexed by
+# the tier_idx batch array: 60% NEXT_DAY, 30% TWO_DAY, 10% ECONOMY.
+_TIERS = (("NEXT_DAY", 8, 20), ("TWO_DAY", 32, 44), ("ECONOMY", 56, 68))
+
+# All possible scanner labels, pre-rendered so scan events index a tuple
+# instead of f-string formatting per event.
+SCANNER_IDS = tuple(f"S-{i:02d}" for i in range(1, 100))
+
+
+def _make_ts_formatter(anchor: datetime):
     """
-    Generate a strictly ordered list of parcel lifecycle events.
+    Build an RFC3339 formatter for int-second offsets from ``anchor``.
 
-    Args
-    ----
-    now_base : datetime (tz-aware)
-        Base "creation" timestamp for the parcel.
-    cfg : dict
-        Runtime configuration, containing:
-          - schema.version
-          - lifecycle timing ranges (min/max minutes between stages)
-          - exceptions probabilities
-          - ETA behaviour
-    schema_dir : str, optional
-        Absolute path to the directory containing:
-          event-envelope.schema.json and events/*.schema.json
-        If None, a sensible default relative to this file is used.
+    A lifecycle emits ~20 timestamps that mostly share a UTC date, so the
+    date part is rendered once per distinct day and the time part comes from
+    plain divmod on epoch seconds — no datetime construction or isoformat
+    per call. Offsets are truncated to whole seconds.
+    """
+    base_epoch = int(anchor.timestamp())
+    date_cache: Dict[int, str] = {}
 
-    Returns
-    -------
-    List[Dict[str, Any]] : ordered list of event payloads.
+    def fmt(off: int) -> str:
+        total = base_epoch + off
+        day, rem = divmod(total, 86400)
+        date_str = date_cache.get(day)
+        if date_str is None:
+            date_str = datetime.fromtimestamp(day * 86400, timezone.utc).strftime("%Y-%m-%d")
+            date_cache[day] = date_str
+        h, rem = divmod(rem, 3600)
+        m, sec = divmod(rem, 60)
+        return f"{date_str}T{h:02d}:{m:02d}:{sec:02d}Z"
+
+    return fmt
+
+
+def _draw_batch(cfg: Dict[str, Any], n: int,
+                rng: np.random.Generator = None) -> Dict[str, Any]:
     """
-    # Resolve schema_dir default lazily
-    if schema_dir is None:
-        schema_dir = _schema_dir_default()
+    Pre-draw every random quantity for ``n`` parcels as NumPy arrays.
 
-    # Common metadata for all events
-    schema_version = cfg["schema"]["version"]
-    event_version = cfg["schema"]["version"]
-    producer = "generator"
+    One vectorized RNG call per quantity replaces ~30 Python-level random.*
+    calls per parcel; the per-parcel builder then only does array indexing.
+    Workers pass their own Generator (see make_worker_rng); by default the
+    module-wide stream is used.
+    """
+    lc = cfg["lifecycle"]
+    eta = cfg["eta"]
+    ex = cfg["exceptions"]
+    if rng is None:
+        rng = _RNG
+
+    # Uniforms: 0 tier, 1 MISSORT, 2 DEPOT_CAPACITY, 3 VEHICLE_BREAKDOWN,
+    # 4 ADDRESS_ISSUE, 5 CUSTOMER_NOT_HOME, 6 eta update draw,
+    # 7 update-count draw, 8/9 second-attempt outcome draws.
+    u = rng.random((n, 10))
+
+    return {
+        "u": u,
+        # Service tier resolved batch-wide to an index into _TIERS
+        "tier_idx": np.where(u[:, 0] < 0.6, 0, np.where(u[:, 0] < 0.9, 1, 2)),
+        # Exception outcomes as bool arrays: one vectorized comparison per
+        # code for the whole batch instead of a threshold test per parcel.
+        "masks": {
+            "MISSORT": u[:, 1] < ex["MISSORT"],
+            "DEPOT_CAPACITY": u[:, 2] < ex["DEPOT_CAPACITY"],
+            "VEHICLE_BREAKDOWN": u[:, 3] < ex["VEHICLE_BREAKDOWN"],
+            "ADDRESS_ISSUE": u[:, 4] < ex["ADDRESS_ISSUE"],
+            "CUSTOMER_NOT_HOME": u[:, 5] < ex["CUSTOMER_NOT_HOME"],
+        },
+        # Pool indices (replaces random.choice per parcel)
+        "m_idx": rng.integers(0, len(MERCHANTS), n),
+        "d_idx": rng.integers(0, len(DEPOTS), n),
+        "c_idx": rng.integers(0, len(COURIERS), n),
+        # Stage offsets in minutes (randint is inclusive; integers is half-open)
+        "created_off": rng.integers(0, 3, n),
+        "in_depot": rng.integers(lc["in_depot_min"], lc["in_depot_max"] + 1, n),
+        "out_depot": rng.integers(lc["out_depot_min"], lc["out_depot_max"] + 1, n),
+        "loaded": rng.integers(lc["loaded_min"], lc["loaded_max"] + 1, n),
+        "ofd": rng.integers(lc["ofd_min"], lc["ofd_max"] + 1, n),
+        # Exception delays
+        "missort_delay": rng.integers(30, 91, n),
+        "capacity_delay": rng.integers(60, 181, n),
+        "break_start": rng.integers(1, 11, n),
+        "break_delay": rng.integers(60, 121, n),
+        # ETA machinery
+        "eta_first": np.maximum(rng.normal(eta["mean_minutes"], eta["sd_minutes"], n), 15.0),
+        "eta_travel": np.maximum(rng.normal(eta["mean_minutes"], eta["sd_minutes"], n), 15.0),
+        "eta0_off": rng.integers(0, 3, n),
+        "upd_gen": rng.integers(5, 31, (n, 2)),
+        "upd_eta": rng.integers(-15, 26, (n, 2)),
+        # Delivery
+        "deliver_noise": rng.normal(0.0, 15.0, n),
+        "second_hours": rng.integers(4, 29, n),
+        "planned_stop": rng.integers(1, 201, n),
+        # Parcel attributes
+        "weight": np.clip(np.exp(rng.normal(6.7, 0.4, n)), 0, 20000),
+        "volume": np.clip(np.exp(rng.normal(7.1, 0.5, n)), 0, 80000),
+        # Scan cosmetics (two scan events per parcel; indexes SCANNER_IDS)
+        "scanner": rng.integers(0, len(SCANNER_IDS), (n, 2)),
+        "belt": rng.integers(1, 6, (n, 2)),
+        # Common-context candidates (injected once per parcel where allowed)
+        "ctx_area": rng.integers(100, 1000, n),
+        "ctx_belt": rng.integers(1, 21, n),
+        "ctx_stage": rng.integers(0, len(_STAGE_HINTS), n),
+    }
 
+
+def _build_lifecycle(now_base: datetime,
+                     schema_version: str,
+                     update_prob: float,
+                     schema_dir: str,
+                     D: Dict[str, Any],
+                     i: int,
+                     new_id=uuid4) -> List[Dict[str, Any]]:
+    """Assemble one parcel's events from row ``i`` of the batch draws.
+
+    The two config scalars a parcel needs (schema version, ETA update
+    probability) arrive pre-extracted, so the builder does no cfg subdict
+    chasing. ``new_id`` supplies UUID strings; batch callers pass a pooled
+    source so the ~20+ ids a parcel needs come from one pre-drawn urandom
+    block.
+    """
     # Generate fixed IDs for this parcel lifecycle
-    parcel_id = uuid4()
-    merchant_id = _choose(MERCHANTS)
-    origin_address_id = uuid4()
-    destination_address_id = uuid4()
-    depot_id = _choose(DEPOTS)
-    courier_id = _choose(COURIERS)
-    route_id = uuid4()
-
-    # Determine promised delivery window based on service tier
-    tier = _service_tier()
-    if tier == "NEXT_DAY":
-        pws = now_base + timedelta(hours=8)
-        pwe = now_base + timedelta(hours=20)
-    elif tier == "TWO_DAY":
-        pws = now_base + timedelta(hours=32)
-        pwe = now_base + timedelta(hours=44)
-    else:  # ECONOMY
-        pws = now_base + timedelta(hours=56)
-        pwe = now_base + timedelta(hours=68)
+    parcel_id = new_id()
+    merchant_id = MERCHANTS[D["m_idx"][i]]
+    origin_address_id = new_id()
+    destination_address_id = new_id()
+    depot_id = DEPOTS[D["d_idx"][i]]
+    courier_id = COURIERS[D["c_idx"][i]]
+    route_id = new_id()
+
+    # Service tier and its promised window come from one table lookup on the
+    # batch-resolved tier index (window offsets are hours from now_base,
+    # i.e. created_off seconds after the creation instant) — no tier branch
+    # in the per-parcel path.
+    u = D["u"][i]
+    tier, pws_h, pwe_h = _TIERS[D["tier_idx"][i]]
 
     # Random weight & volume within plausible operational bounds
-    weight_grams = int(clamp(random.lognormvariate(6.7, 0.4), 0, 20000))
-    volume_cm3 = int(clamp(random.lognormvariate(7.1, 0.5), 0, 80000))
-
-    # Sequence counter ensures unique ordering within a parcel's events
-    seq = 0
-    events: List[Dict[str, Any]] = []
-
-    def env(evt: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Attach envelope metadata, inject schema-allowed common fields, increment sequence.
-        """
-        nonlocal seq
-        event_type = evt.get("event_type", "UNKNOWN")
-
-        # Envelope (always allowed)
-        base = {
-            "schema_version": schema_version,
-            "event_version": event_version,
-            "event_id": uuid4(),
-            "parcel_id": parcel_id,
-            "producer": producer,
-            "sequence_no": seq
-        }
-        seq += 1
-        base.update(evt)
-
-        # Determine which fields are allowed for this event_type
-        allowed = _allowed_fields_for(event_type, schema_dir)
-
-        # Build candidate common context (ONLY injected if allowed by event schema)
-        common_context = {
-            "trace_id": uuid4(),
-            "generated_ts": rfc3339(datetime.now(timezone.utc)),
-            "route_id": route_id,
-            "depot_id": depot_id,
-            "weight_grams": weight_grams,       # Allowed on PARCEL_CREATED
-            "volume_cm3": volume_cm3,          # Allowed on PARCEL_CREATED
-            "area_code": f"AREA-{random.randint(100, 999)}",
-            "belt_no": random.randint(1, 20),
-            "stage_hint": random.choice(["FIRST_MILE", "DEPOT", "LINEHAUL", "LAST_MILE"]),
-            "merchant_id": merchant_id,        # Allowed on PARCEL_CREATED
-            "origin_address_id": origin_address_id,       # Allowed on PARCEL_CREATED
-            "destination_address_id": destination_address_id,  # Allowed on PARCEL_CREATED
-        }
-
-        # Inject only allowed fields that are not already set
-        enriched = _inject_common_fields(base, allowed, common_context)
-        return enriched
+    weight_grams = int(D["weight"][i])
+    volume_cm3 = int(D["volume"][i])
+
+    # Envelope fields invariant across this parcel's events, built once and
+    # spread into each event instead of re-keyed per dict.
+    common_env = {
+        "schema_version": schema_version,
+        "event_version": schema_version,
+        "parcel_id": parcel_id,
+        "producer": "generator",
+    }
+
+    # Full stage schedule as int-second offsets from the creation instant;
+    # datetimes are materialized only where an event is actually built.
+    S = compute_schedule(D, i, update_prob)
+    t_created = now_base - timedelta(seconds=S["created_off"])
+    fmt = _make_ts_formatter(t_created)
+
+    # Parcel-invariant common context, built once; trace_id and generated_ts
+    # are per-event and produced inside _emit. Injected only where the event
+    # schema allows the field.
+    context = {
+        "route_id": route_id,
+        "depot_id": depot_id,
+        "weight_grams": weight_grams,       # Allowed on PARCEL_CREATED
+        "volume_cm3": volume_cm3,          # Allowed on PARCEL_CREATED
+        "area_code": f"AREA-{D['ctx_area'][i]}",
+        "belt_no": int(D["ctx_belt"][i]),
+        "stage_hint": _STAGE_HINTS[D["ctx_stage"][i]],
+        "merchant_id": merchant_id,        # Allowed on PARCEL_CREATED
+        "origin_address_id": origin_address_id,       # Allowed on PARCEL_CREATED
+        "destination_address_id": destination_address_id,  # Allowed on PARCEL_CREATED
+    }
+
+    # Payload/offset pairs collected first; events are materialized in one
+    # comprehension at the end, with sequence_no assigned by position.
+    to_emit: List[Any] = []
+    emit = to_emit.append
 
     # -------------------------------------------------------------------
     # 1) PARCEL_CREATED
     # -------------------------------------------------------------------
-    t_created = now_base - timedelta(minutes=random.randint(0, 2))
-    events.append(env({
+    emit(({
         "event_type": "PARCEL_CREATED",
-        "event_ts": rfc3339(t_created),
         "service_tier": tier,
-        "created_ts": rfc3339(t_created - timedelta(minutes=2)),
-        "promised_window_start": rfc3339(pws),
-        "promised_window_end": rfc3339(pwe),
-        # merchant_id / addresses / weight / volume are injected by env()
-    }))
+        "created_ts": fmt(-120),
+        "promised_window_start": fmt(S["created_off"] + pws_h * 3600),
+        "promised_window_end": fmt(S["created_off"] + pwe_h * 3600),
+        # merchant_id / addresses / weight / volume are injected by _emit
+    }, 0))
 
     # -------------------------------------------------------------------
     # 2) SCAN_IN_DEPOT (+ possible depot exceptions)
     # -------------------------------------------------------------------
-    lc = cfg["lifecycle"]
-    t_in = t_created + deltas_minutes(lc["in_depot_min"], lc["in_depot_max"])
-    events.append(env({
+    emit(({
         "event_type": "SCAN_IN_DEPOT",
-        "event_ts": rfc3339(t_in),
-        "scanner_id": f"S-{random.randint(1,99):02d}",
+        "scanner_id": SCANNER_IDS[D["scanner"][i, 0]],
         "area_code": "INBOUND-A",  # explicit (also would be injected if allowed)
-        "belt_no": random.randint(1, 5)
-    }))
-
-    add_delay = timedelta(0)
-    ex = cfg["exceptions"]
+        "belt_no": int(D["belt"][i, 0])
+    }, S["t_in"]))
 
     # Missort exception
-    if random.random() < ex["MISSORT"]:
-        events.append(env({
+    if S["missort"]:
+        emit(({
             "event_type": "EXCEPTION",
-            "event_ts": rfc3339(t_in + timedelta(seconds=1)),
             "exception_code": "MISSORT",
             "stage_hint": "DEPOT",
             "details": "Parcel routed to incorrect belt"
-        }))
-        add_delay += timedelta(minutes=random.randint(30, 90))
+        }, S["t_in"] + 1))
 
     # Depot capacity exception
-    if random.random() < ex["DEPOT_CAPACITY"]:
-        events.append(env({
+    if S["capacity"]:
+        emit(({
             "event_type": "EXCEPTION",
-            "event_ts": rfc3339(t_in + timedelta(seconds=2)),
             "exception_code": "DEPOT_CAPACITY",
             "stage_hint": "DEPOT",
             "details": "Temporary capacity constraint"
-        }))
-        add_delay += timedelta(minutes=random.randint(60, 180))
+        }, S["t_in"] + 2))
 
     # -------------------------------------------------------------------
     # 3) SCAN_OUT_DEPOT
     # -------------------------------------------------------------------
-    t_out = t_in + deltas_minutes(lc["out_depot_min"], lc["out_depot_max"]) + add_delay
-    events.append(env({
+    emit(({
         "event_type": "SCAN_OUT_DEPOT",
-        "event_ts": rfc3339(t_out),
-        "scanner_id": f"S-{random.randint(1,99):02d}",
+        "scanner_id": SCANNER_IDS[D["scanner"][i, 1]],
         "area_code": "OUTBOUND-B",
-        "belt_no": random.randint(1, 5)
-    }))
+        "belt_no": int(D["belt"][i, 1])
+    }, S["t_out"]))
 
     # -------------------------------------------------------------------
     # 4) LOADED_TO_VAN (+ possible breakdown)
     # -------------------------------------------------------------------
-    t_loaded = t_out + deltas_minutes(lc["loaded_min"], lc["loaded_max"])
-    events.append(env({
+    emit(({
         "event_type": "LOADED_TO_VAN",
-        "event_ts": rfc3339(t_loaded),
         "courier_id": courier_id,
-        "planned_stop_seq": random.randint(1, 200)
-        # route_id injected by env() if allowed
-    }))
-
-    breakdown_delay = timedelta(0)
-    if random.random() < ex["VEHICLE_BREAKDOWN"]:
-        t_break = t_loaded + timedelta(minutes=random.randint(1, 10))
-        events.append(env({
+        "planned_stop_seq": int(D["planned_stop"][i])
+        # route_id injected by _emit if allowed
+    }, S["t_loaded"]))
+
+    if S["breakdown"]:
+        emit(({
             "event_type": "EXCEPTION",
-            "event_ts": rfc3339(t_break),
             "exception_code": "VEHICLE_BREAKDOWN",
             "stage_hint": "LAST_MILE",
             "details": "Temporary breakdown, route delayed"
-        }))
-        breakdown_delay += timedelta(minutes=random.randint(60, 120))
+        }, S["t_break"]))
 
     # -------------------------------------------------------------------
     # 5) OUT_FOR_DELIVERY
     # -------------------------------------------------------------------
-    t_ofd = t_loaded + deltas_minutes(lc["ofd_min"], lc["ofd_max"]) + breakdown_delay
-    first_eta = normal_minutes(cfg["eta"]["mean_minutes"], cfg["eta"]["sd_minutes"], 15)
-    events.append(env({
+    emit(({
         "event_type": "OUT_FOR_DELIVERY",
-        "event_ts": rfc3339(t_ofd),
-        "first_planned_eta_ts": rfc3339(t_ofd + first_eta)
-        # route_id injected by env() if allowed
-    }))
+        "first_planned_eta_ts": fmt(S["t_ofd"] + S["first_eta"])
+        # route_id injected by _emit if allowed
+    }, S["t_ofd"]))
 
     # -------------------------------------------------------------------
     # 6) ETA_SET
     # -------------------------------------------------------------------
-    t_eta0 = t_ofd + timedelta(minutes=random.randint(0, 2))
-    travel = normal_minutes(cfg["eta"]["mean_minutes"], cfg["eta"]["sd_minutes"], 15)
-    last_eta = t_ofd + travel
-    last_gen = t_eta0
-    events.append(env({
+    emit(({
         "event_type": "ETA_SET",
-        "event_ts": rfc3339(t_eta0),
-        "predicted_delivery_ts": rfc3339(last_eta),
-        "generated_ts": rfc3339(t_eta0),  # explicit; env() also sets if allowed
+        "predicted_delivery_ts": fmt(S["t_ofd"] + S["travel"]),
+        "generated_ts": fmt(S["t_eta0"]),  # explicit; _emit also sets if allowed
         "source": "PLANNER"
-        # route_id injected by env() if allowed
-    }))
+        # route_id injected by _emit if allowed
+    }, S["t_eta0"]))
 
     # -------------------------------------------------------------------
     # 7) ETA_UPDATED (0–2 times)
     # -------------------------------------------------------------------
-    updates = 0
-    if random.random() < cfg["eta"]["update_prob"]:
-        updates = 1 if random.random() < 0.7 else 2
-    for _ in range(updates):
-        last_gen = last_gen + timedelta(minutes=random.randint(5, 30))
-        last_eta = last_eta + timedelta(minutes=random.randint(-15, 25))
-        events.append(env({
+    for gen_off, eta_off in S["updates"]:
+        emit(({
             "event_type": "ETA_UPDATED",
-            "event_ts": rfc3339(last_gen),
-            "predicted_delivery_ts": rfc3339(last_eta),
-            "generated_ts": rfc3339(last_gen),
+            "predicted_delivery_ts": fmt(eta_off),
+            "generated_ts": fmt(gen_off),
             "source": "RECOMPUTE"
-            # route_id injected by env() if allowed
-        }))
+            # route_id injected by _emit if allowed
+        }, gen_off))
 
     # -------------------------------------------------------------------
     # 8) DELIVERED (+ second attempt if failed/carded)
@@ -406,13 +515,9 @@ def generate_parcel_lifecycle(now_base: datetime,
     outcome = "SUCCESS"
     failure_reason = None
     attempt_number = 1
-    addr_issue = random.random() < ex["ADDRESS_ISSUE"]
-    not_home = (not addr_issue) and (random.random() < ex["CUSTOMER_NOT_HOME"])
-
-    noise = timedelta(minutes=random.gauss(0, 15))
-    t_delivered_first = t_ofd + travel + noise
-    if t_delivered_first < t_ofd + timedelta(minutes=10):
-        t_delivered_first = t_ofd + timedelta(minutes=10)
+    masks = D["masks"]
+    addr_issue = bool(masks["ADDRESS_ISSUE"][i])
+    not_home = (not addr_issue) and bool(masks["CUSTOMER_NOT_HOME"][i])
 
     if addr_issue:
         outcome = "FAILED"
@@ -420,47 +525,206 @@ def generate_parcel_lifecycle(now_base: datetime,
     elif not_home:
         outcome = "CARDED"
 
-    delivered_event = {
+    emit(({
         "event_type": "DELIVERED",
-        "event_ts": rfc3339(t_delivered_first),
-        "delivered_ts": rfc3339(t_delivered_first),
+        "delivered_ts": fmt(S["t_delivered"]),
         "attempt_number": attempt_number,
         "outcome": outcome,
-        "courier_id": courier_id
-        # route_id injected by env() if allowed
-    }
-    if failure_reason:  # Only include if not None/empty
-        delivered_event["failure_reason"] = failure_reason
-    events.append(env(delivered_event))
+        "courier_id": courier_id,
+        # route_id injected by _emit if allowed;
+        # failure_reason only present when set (schema omits it otherwise)
+        **({"failure_reason": failure_reason} if failure_reason else {}),
+    }, S["t_delivered"]))
 
     # Second attempt logic
     if outcome in ("CARDED", "FAILED"):
         attempt_number = 2
-        t_second = t_delivered_first + timedelta(hours=random.randint(4, 28))
-        second_outcome = "SUCCESS" if random.random() < 0.85 else (
-            "FAILED" if random.random() < 0.6 else "RETURNED"
+        second_outcome = "SUCCESS" if u[8] < 0.85 else (
+            "FAILED" if u[9] < 0.6 else "RETURNED"
         )
-        delivered_event_2 = {
+        emit(({
             "event_type": "DELIVERED",
-            "event_ts": rfc3339(t_second),
-            "delivered_ts": rfc3339(t_second),
+            "delivered_ts": fmt(S["t_second"]),
             "attempt_number": attempt_number,
             "outcome": second_outcome,
-            "courier_id": courier_id
-        }
-        if second_outcome == "FAILED":
-            delivered_event_2["failure_reason"] = "UNSPECIFIED"
-        events.append(env(delivered_event_2))
+            "courier_id": courier_id,
+            **({"failure_reason": "UNSPECIFIED"}
+               if second_outcome == "FAILED" else {}),
+        }, S["t_second"]))
 
-    # -------------------------------------------------------------------
-    # Final pass: ensure event_ts are strictly non-decreasing
-    # -------------------------------------------------------------------
-    prev = datetime.min.replace(tzinfo=timezone.utc)
-    for e in events:
-        ts = datetime.fromisoformat(e["event_ts"].replace("Z", "+00:00"))
-        if ts < prev:
-            ts = prev + timedelta(seconds=1)
-            e["event_ts"] = rfc3339(ts)
-        prev = ts
-
-    return events
+    return [_emit(seq, evt, fmt(off), common_env, context, schema_dir, new_id)
+            for seq, (evt, off) in enumerate(to_emit)]
+
+
+def _uuid_pool(n_parcels: int):
+    """
+    Return a callable yielding UUID strings from pre-drawn urandom blocks.
+
+    A lifecycle needs up to ~28 ids (parcel/address/route ids plus event_id
+    and trace_id per event), so the pool is sized generously per batch and
+    refilled in bulk on the rare overrun.
+    """
+    pool = uuid4_batch(n_parcels * 32)
+    idx = 0
+
+    def take() -> str:
+        nonlocal pool, idx
+        if idx >= len(pool):
+            pool = uuid4_batch(max(64, n_parcels * 8))
+            idx = 0
+        v = pool[idx]
+        idx += 1
+        return v
+
+    return take
+
+
+def generate_parcel_batch(now_base: datetime,
+                          cfg: Dict[str, Any],
+                          n_parcels: int,
+                          schema_dir: str = None,
+                          rng: np.random.Generator = None) -> List[List[Dict[str, Any]]]:
+    """
+    Generate ``n_parcels`` lifecycles with all randomness pre-drawn in bulk.
+
+    Every random quantity for the whole batch comes from one vectorized RNG
+    call (see _draw_batch); the per-parcel assembly only indexes into the
+    arrays. Returns a list of lifecycles, each an ordered event list.
+    """
+    if schema_dir is None:
+        schema_dir = _schema_dir_default()
+    if n_parcels <= 0:
+        return []
+    _load_schemas_once(schema_dir)
+
+    draws = _draw_batch(cfg, n_parcels, rng)
+    new_id = _uuid_pool(n_parcels)
+    schema_version = cfg["schema"]["version"]
+    update_prob = cfg["eta"]["update_prob"]
+    return [_build_lifecycle(now_base, schema_version, update_prob,
+                             schema_dir, draws, i, new_id)
+            for i in range(n_parcels)]
+
+
+def generate_parcel_batch_bytes(now_base: datetime,
+                                cfg: Dict[str, Any],
+                                n_parcels: int,
+                                schema_dir: str = None) -> bytes:
+    """
+    Generate ``n_parcels`` lifecycles serialized as one JSON document.
+
+    One orjson.dumps call over the whole batch (a JSON array of lifecycles,
+    each an ordered event array) replaces per-event json.dumps for callers
+    that ship the batch onward as bytes.
+    """
+    return orjson.dumps(generate_parcel_batch(now_base, cfg, n_parcels, schema_dir))
+
+
+def generate_parcel_batch_ndjson(now_base: datetime,
+                                 cfg: Dict[str, Any],
+                                 n_parcels: int,
+                                 schema_dir: str = None,
+                                 rng: np.random.Generator = None) -> bytes:
+    """
+    Generate ``n_parcels`` lifecycles as newline-delimited JSON bytes.
+
+    Events are serialized parcel by parcel into one growing buffer, so only
+    a single lifecycle's dicts are alive at a time — the per-event dict
+    overhead never accumulates across the batch. Suited to sinks that take
+    bytes directly (HTTP bodies, file dumps, load tooling).
+    """
+    if schema_dir is None:
+        schema_dir = _schema_dir_default()
+    if n_parcels <= 0:
+        return b""
+    _load_schemas_once(schema_dir)
+
+    draws = _draw_batch(cfg, n_parcels, rng)
+    new_id = _uuid_pool(n_parcels)
+    schema_version = cfg["schema"]["version"]
+    update_prob = cfg["eta"]["update_prob"]
+    out = bytearray()
+    for i in range(n_parcels):
+        for evt in _build_lifecycle(now_base, schema_version, update_prob,
+                                    schema_dir, draws, i, new_id):
+            out += orjson.dumps(evt)
+            out += b"\n"
+    return bytes(out)
+
+
+def _parallel_chunk(args) -> List[List[Dict[str, Any]]]:
+    """Child-process entry: build one worker's share of the batch."""
+    worker_id, n, now_base, cfg, schema_dir = args
+    return generate_parcel_batch(now_base, cfg, n, schema_dir,
+                                 rng=make_worker_rng(worker_id))
+
+
+def generate_parcels_parallel(now_base: datetime,
+                              cfg: Dict[str, Any],
+                              n_parcels: int,
+                              schema_dir: str = None,
+                              workers: int = None) -> List[List[Dict[str, Any]]]:
+    """
+    Generate ``n_parcels`` lifecycles across a process pool.
+
+    Lifecycles are embarrassingly parallel — the only shared state is the
+    schema-derived caches, which each child builds once on first use.
+    Processes rather than threads because assembly is pure-Python CPU work
+    under the GIL. Worker ``w`` draws from the spawn-key stream
+    ``make_worker_rng(w)``, so output is reproducible for a fixed worker
+    count, and chunks are merged in worker order so the result is
+    deterministic. Small batches fall through to the single-process path,
+    where pool startup would dominate.
+    """
+    if schema_dir is None:
+        schema_dir = _schema_dir_default()
+    if n_parcels <= 0:
+        return []
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, n_parcels)
+    if workers <= 1:
+        return generate_parcel_batch(now_base, cfg, n_parcels, schema_dir)
+
+    base, extra = divmod(n_parcels, workers)
+    jobs = [(w, base + (1 if w < extra else 0), now_base, cfg, schema_dir)
+            for w in range(workers)]
+    out: List[List[Dict[str, Any]]] = []
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        for chunk in ex.map(_parallel_chunk, jobs):
+            out.extend(chunk)
+    return out
+
+
+def generate_parcel_lifecycle(now_base: datetime,
+                              cfg: Dict[str, Any],
+                              schema_dir: str = None) -> List[Dict[str, Any]]:
+    """
+    Generate a strictly ordered list of parcel lifecycle events.
+
+    Args
+    ----
+    now_base : datetime (tz-aware)
+        Base "creation" timestamp for the parcel.
+    cfg : dict
+        Runtime configuration, containing:
+          - schema.version
+          - lifecycle timing ranges (min/max minutes between stages)
+          - exceptions probabilities
+          - ETA behaviour
+    schema_dir : str, optional
+        Absolute path to the directory containing:
+          event-envelope.schema.json and events/*.schema.json
+        If None, a sensible default relative to this file is used.
+
+    Returns
+    -------
+    List[Dict[str, Any]] : ordered list of event payloads.
+
+    Notes
+    -----
+    This is the batch-of-one convenience wrapper; callers producing many
+    parcels per tick should use generate_parcel_batch to amortize the RNG
+    draws across the whole batch.
+    """
+    return generate_parcel_batch(now_base, cfg, 1, schema_dir)[0]
@@ -0,0 +1,152 @@
+# app/generator_core.py
+"""
+Numeric timing core for the parcel lifecycle generator.
+
+Computes one parcel's full stage schedule as plain int seconds relative to
+the parcel's creation instant. Keeping the kernel datetime-free means the
+hot loop is pure integer arithmetic over the pre-drawn batch arrays; the
+caller converts offsets to datetimes only at the point an event is built.
+
+The arithmetic lives in ``_schedule_kernel``, a scalar function compiled
+with numba.njit when numba is importable. numba is an opt-in accelerator,
+not a hard dependency: without it the same function runs as plain Python
+and produces identical offsets.
+"""
+
+from typing import Any, Dict
+
+from .utils import njit
+
+
+@njit(cache=True)
+def _schedule_kernel(created_off_min: int,
+                     in_depot_min: int,
+                     missort: bool,
+                     missort_delay_min: int,
+                     capacity: bool,
+                     capacity_delay_min: int,
+                     out_depot_min: int,
+                     loaded_min: int,
+                     breakdown: bool,
+                     break_start_min: int,
+                     break_delay_min: int,
+                     ofd_min: int,
+                     eta_first_min: float,
+                     eta_travel_min: float,
+                     eta0_off_min: int,
+                     deliver_noise_min: float,
+                     second_hours: int):
+    """Pure scalar stage arithmetic; all outputs are int seconds."""
+    created_off = created_off_min * 60
+    t_in = in_depot_min * 60
+
+    add_delay = 0
+    if missort:
+        add_delay += missort_delay_min * 60
+    if capacity:
+        add_delay += capacity_delay_min * 60
+
+    # Stages are clamped forward as they are computed, so emission order is
+    # non-decreasing by construction (no fix-up pass downstream). Depot
+    # exception events sit at t_in+1 / t_in+2, hence the +2 floor.
+    t_out = t_in + out_depot_min * 60 + add_delay
+    if t_out < t_in + 2:
+        t_out = t_in + 2
+    t_loaded = t_out + loaded_min * 60
+
+    breakdown_delay = break_delay_min * 60 if breakdown else 0
+    t_break = t_loaded + break_start_min * 60 if breakdown else 0
+
+    t_ofd = t_loaded + ofd_min * 60 + breakdown_delay
+    if breakdown and t_ofd < t_break:
+        t_ofd = t_break
+
+    first_eta = int(eta_first_min * 60.0)
+    travel = int(eta_travel_min * 60.0)
+    t_eta0 = t_ofd + eta0_off_min * 60
+
+    # First attempt: travel plus noise, floored at 10 minutes after OFD
+    t_delivered = t_ofd + travel + int(deliver_noise_min * 60.0)
+    floor = t_ofd + 600
+    if t_delivered < floor:
+        t_delivered = floor
+
+    t_second = t_delivered + second_hours * 3600
+
+    return (created_off, t_in, t_out, t_loaded, t_break, t_ofd,
+            first_eta, travel, t_eta0, t_delivered, t_second)
+
+
+def compute_schedule(D: Dict[str, Any],
+                     i: int,
+                     update_prob: float) -> Dict[str, Any]:
+    """
+    Resolve row ``i`` of the batch draws into one parcel's timing schedule.
+
+    All offsets are whole seconds since the parcel's creation time (the
+    caller anchors ``created_off`` seconds before its base timestamp).
+    Exception flags ride along so the draw row is interpreted exactly once.
+    """
+    u = D["u"][i]
+    masks = D["masks"]
+
+    missort = bool(masks["MISSORT"][i])
+    capacity = bool(masks["DEPOT_CAPACITY"][i])
+    breakdown = bool(masks["VEHICLE_BREAKDOWN"][i])
+
+    (created_off, t_in, t_out, t_loaded, t_break, t_ofd,
+     first_eta, travel, t_eta0, t_delivered, t_second) = _schedule_kernel(
+        int(D["created_off"][i]),
+        int(D["in_depot"][i]),
+        missort,
+        int(D["missort_delay"][i]),
+        capacity,
+        int(D["capacity_delay"][i]),
+        int(D["out_depot"][i]),
+        int(D["loaded"][i]),
+        breakdown,
+        int(D["break_start"][i]),
+        int(D["break_delay"][i]),
+        int(D["ofd"][i]),
+        float(D["eta_first"][i]),
+        float(D["eta_travel"][i]),
+        int(D["eta0_off"][i]),
+        float(D["deliver_noise"][i]),
+        int(D["second_hours"][i]),
+    )
+
+    # 0-2 ETA recomputes: (generated, predicted) offset pairs
+    updates = 0
+    if u[6] < update_prob:
+        updates = 1 if u[7] < 0.7 else 2
+    upd = []
+    last_gen = t_eta0
+    last_eta = t_ofd + travel
+    for j in range(updates):
+        last_gen += int(D["upd_gen"][i, j]) * 60
+        last_eta += int(D["upd_eta"][i, j]) * 60
+        upd.append((last_gen, last_eta))
+
+    # The last ETA recompute can land after the attempt the kernel chose;
+    # shift the delivery attempts forward so the schedule stays monotonic.
+    if t_delivered < last_gen:
+        t_second += last_gen - t_delivered
+        t_delivered = last_gen
+
+    return {
+        "created_off": created_off,
+        "t_in": t_in,
+        "missort": missort,
+        "capacity": capacity,
+        "t_out": t_out,
+        "t_loaded": t_loaded,
+        "breakdown": breakdown,
+        "t_break": t_break,
+        "t_ofd": t_ofd,
+        "first_eta": first_eta,
+        "travel": travel,
+        "t_eta0": t_eta0,
+        "updates": upd,
+        "t_delivered": t_delivered,
+        "t_second": t_second,
+    }
@@ -14,11 +14,15 @@ Validating against the envelope separately would fail due to `additionalProperti
 on fields that belong to the type-specific schema.
 """
 
-import json
+import importlib.util
 import os
-from typing import Dict, Tuple
+import random
+import re
 
-from jsonschema import RefResolver
+import orjson
+from typing import Callable, Dict, List, Optional, Tuple
+
+from jsonschema import FormatChecker, ValidationError
 from jsonschema.validators import validator_for
 
 # Map event_type -> canonical schema $id in /data_contracts/schemas/events
@@ -34,24 +38,234 @@ EVENT_SCHEMA_IDS = {
     "EXCEPTION": "https://relay-spec.example/schemas/events/exception.schema.json",
 }
 
+# event_type -> dense index into the registry's validator lists. validate()
+# previously hashed the type string three times (membership, fast lookup,
+# interpretive lookup); with the index it hashes once and the rest are
+# list indexing.
+_EVENT_TYPE_INDEX = {name: i for i, name in enumerate(EVENT_SCHEMA_IDS)}
+
+
+# Opt-in format checking (check_formats=True). The default jsonschema
+# checkers go through rfc3339/uuid libraries per field; the contracts only
+# use "date-time" and "uuid", and both are cheap as precompiled regexes.
+# Built empty so no other global checkers ride along.
+_RFC3339_RE = re.compile(
+    r"\d{4}-\d{2}-\d{2}[Tt]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:[Zz]|[+-]\d{2}:\d{2})")
+_UUID_RE = re.compile(
+    r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+
+_FORMAT_CHECKER = FormatChecker(formats=())
+
+
+@_FORMAT_CHECKER.checks("date-time")
+def _check_date_time(value: object) -> bool:
+    # Formats only constrain strings per the spec; other types pass here
+    # and fail the type check instead.
+    return not isinstance(value, str) or _RFC3339_RE.fullmatch(value) is not None
+
+
+@_FORMAT_CHECKER.checks("uuid")
+def _check_uuid(value: object) -> bool:
+    return not isinstance(value, str) or _UUID_RE.fullmatch(value) is not None
+
+
+# Constraint keywords the code generator understands. "format" is listed but
+# intentionally emitted as a no-op: draft 2020-12 treats format as an
+# annotation unless a format checker is attached, and the interpretive
+# validators here don't attach one — codegen must match that behaviour.
+_CODEGEN_PROP_KEYS = {"type", "pattern", "format", "enum", "const",
+                      "minimum", "minLength"}
+_CODEGEN_BRANCH_KEYS = {"type", "properties", "required", "additionalProperties"}
+
+
+def load_compiled_schemas(schema_dir: str):
+    """
+    Import ``<schema_dir>/_compiled.py`` if the build step produced it.
+
+    tools/build_schema_module.py bakes the contracts into a Python module
+    (ENVELOPE / EVENTS / ALLOWED_FIELDS) so startup skips the per-file
+    listdir + open + parse pass. Returns the module, or None when the
+    compiled form is absent — callers fall back to reading the JSON files,
+    which remain the source of truth.
+    """
+    path = os.path.join(schema_dir, "_compiled.py")
+    if not os.path.isfile(path):
+        return None
+    spec = importlib.util.spec_from_file_location("relay_schemas_compiled", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _compile_validator(event_type: str, schema: Dict) -> Optional[Callable]:
+    """
+    Generate a straight-line validate(evt) function for one event contract.
+
+    Event schemas replicate every envelope constraint inside their second
+    allOf branch (the one carrying additionalProperties: false), so checking
+    that branch alone enforces the full contract with zero ref traversal.
+    Emits plain required/extra-key set arithmetic, isinstance checks,
+    precompiled regex matches and enum membership tests, then exec()s the
+    source once. Returns None when the schema uses a construct the generator
+    doesn't understand — the caller keeps the interpretive validator instead.
+    """
+    all_of = schema.get("allOf") or []
+    if len(all_of) < 2:
+        return None
+    branch = all_of[1]
+    if branch.get("type") != "object" or set(branch) - _CODEGEN_BRANCH_KEYS:
+        return None
+
+    props = branch.get("properties") or {}
+    required = branch.get("required") or []
+    ns: Dict[str, object] = {"ValidationError": ValidationError}
+    lines = ["def _validate(evt):",
+             "    if not isinstance(evt, dict):",
+             "        raise ValidationError('event is not an object')"]
+
+    if required:
+        ns["_required"] = frozenset(required)
+        lines += [
+            "    missing = _required - evt.keys()",
+            "    if missing:",
+            "        raise ValidationError("
+            "'missing required fields: ' + ', '.join(sorted(missing)))",
+        ]
+    if branch.get("additionalProperties") is False:
+        ns["_allowed"] = frozenset(props)
+        lines += [
+            "    extra = evt.keys() - _allowed",
+            "    if extra:",
+            "        raise ValidationError("
+            "'unexpected fields: ' + ', '.join(sorted(extra)))",
+        ]
+
+    for idx, (name, spec) in enumerate(props.items()):
+        if not isinstance(spec, dict) or set(spec) - _CODEGEN_PROP_KEYS:
+            return None
+        checks = []
+        ptype = spec.get("type")
+        if ptype == "string":
+            checks.append(f"not isinstance(v, str) and (_err := 'is not a string')")
+        elif ptype == "integer":
+            checks.append("(not isinstance(v, int) or isinstance(v, bool))"
+                          " and (_err := 'is not an integer')")
+        elif ptype is not None:
+            return None
+        if "pattern" in spec:
+            ns[f"_re{idx}"] = re.compile(spec["pattern"])
+            checks.append(f"_re{idx}.search(v) is None and (_err := 'does not match pattern')")
+        if "const" in spec:
+            ns[f"_c{idx}"] = spec["const"]
+            checks.append(f"v != _c{idx} and (_err := 'is not the expected constant')")
+        if "enum" in spec:
+            ns[f"_e{idx}"] = frozenset(spec["enum"])
+            checks.append(f"v not in _e{idx} and (_err := 'is not one of the allowed values')")
+        if "minimum" in spec:
+            checks.append(f"v < {spec['minimum']!r} and (_err := 'is below the minimum')")
+        if "minLength" in spec:
+            checks.append(f"len(v) < {spec['minLength']!r} and (_err := 'is too short')")
+        if not checks:
+            continue
+        lines.append(f"    if {name!r} in evt:")
+        lines.append(f"        v = evt[{name!r}]")
+        for check in checks:
+            lines.append(f"        if {check}:")
+            lines.append(f"            raise ValidationError({name!r} + ' ' + _err)")
+
+    exec("\n".join(lines), ns)  # noqa: S102 - source derived from local contracts only
+    return ns["_validate"]
+
 
 class SchemaRegistry:
     """
-    Loads the envelope + all event-type schemas into an in-memory store for fast
-    ref resolution. Validation picks the correct validator for the target schema's
-    declared metaschema (draft-07 or 2020-12) automatically.
+    Loads the envelope + all event-type schemas into an in-memory store and
+    inlines the envelope `$ref` into each contract at build time, so
+    validators are self-contained. Validation picks the correct validator for
+    the target schema's declared metaschema (draft-07 or 2020-12)
+    automatically.
     """
 
-    def __init__(self, schema_dir: str):
+    def __init__(self, schema_dir: str,
+                 validate_events: bool = True,
+                 sample_rate: float = 1.0,
+                 check_formats: bool = False):
+        # The generator emits synthetic data that is schema-conformant by
+        # construction, so validation is a drift tripwire rather than a
+        # correctness gate. validate_events=False turns validate() into a
+        # no-op; sample_rate < 1.0 checks only that fraction of events.
+        # check_formats=True additionally enforces "date-time"/"uuid" via
+        # the precompiled-regex checker (format is annotation-only by
+        # default, matching the codegen validators).
         self.schema_dir = schema_dir
+        self.validate_events = validate_events
+        self.sample_rate = sample_rate
+        self.check_formats = check_formats
         self.envelope_schema, self.store = self._load_schemas(schema_dir)
-        # A RefResolver with `store` lets $ref resolve by $id without hitting the network.
-        self.resolver = RefResolver.from_schema(self.envelope_schema, store=self.store)
+
+        # Build one validator per event type at startup. Constructing a
+        # validator (and check_schema) per event re-walks the schema on every
+        # call; doing it here means validate() is one index lookup plus the
+        # actual instance check. check_schema also fails fast on a broken
+        # contract before any traffic flows. Both collections are lists
+        # positioned by _EVENT_TYPE_INDEX, so dispatch is a single string
+        # hash followed by list indexing.
+        self._validators: List[Optional[object]] = [None] * len(EVENT_SCHEMA_IDS)
+        # Code-generated straight-line validators; any contract the generator
+        # can't fully express falls back to the interpretive instance above.
+        self._fast_validators: List[Optional[Callable]] = [None] * len(EVENT_SCHEMA_IDS)
+        for event_type, schema_id in EVENT_SCHEMA_IDS.items():
+            schema = self.store.get(schema_id)
+            if schema is None:
+                continue
+            idx = _EVENT_TYPE_INDEX[event_type]
+            # The only $ref any contract carries is allOf[0] -> the envelope,
+            # which is local; substituting the envelope dict here makes every
+            # validator self-contained, so no resolver (and no per-validation
+            # ref dereference) is needed at all.
+            inlined = self._inline_local_refs(schema)
+            Validator = validator_for(inlined)
+            Validator.check_schema(inlined)
+            # format_checker=None is the library default, but spelled out:
+            # format stays annotation-only, and the codegen validators below
+            # rely on matching that behaviour exactly. In strict mode the
+            # regex-backed checker is attached and codegen is skipped, since
+            # the generated checkers don't enforce formats.
+            checker = _FORMAT_CHECKER if self.check_formats else None
+            self._validators[idx] = Validator(inlined, format_checker=checker)
+            self._fast_validators[idx] = (
+                None if self.check_formats
+                else _compile_validator(event_type, schema))
+
+    def _inline_local_refs(self, schema: Dict) -> Dict:
+        """Return ``schema`` with any allOf `$ref` to a stored `$id` replaced
+        by the referenced schema itself. Copies rather than mutates — the
+        store may be shared with the compiled module."""
+        all_of = schema.get("allOf")
+        if not all_of:
+            return schema
+        parts = []
+        changed = False
+        for part in all_of:
+            ref = part.get("$ref") if isinstance(part, dict) else None
+            if ref is not None and len(part) == 1 and ref in self.store:
+                parts.append(self.store[ref])
+                changed = True
+            else:
+                parts.append(part)
+        if not changed:
+            return schema
+        return {**schema, "allOf": parts}
 
     def _load_schemas(self, schema_dir: str) -> Tuple[Dict, Dict]:
         """Load envelope and event schemas into a single `$id` -> schema dict."""
-        with open(os.path.join(schema_dir, "event-envelope.schema.json"), "r") as f:
-            envelope = json.load(f)
+        compiled = load_compiled_schemas(schema_dir)
+        if compiled is not None:
+            envelope = compiled.ENVELOPE
+            return envelope, {envelope["$id"]: envelope, **compiled.EVENTS}
+
+        with open(os.path.join(schema_dir, "event-envelope.schema.json"), "rb") as f:
+            envelope = orjson.loads(f.read())
 
         events_dir = os.path.join(schema_dir, "events")
         store: Dict[str, Dict] = {envelope["$id"]: envelope}
@@ -59,8 +273,8 @@ class SchemaRegistry:
         for fname in sorted(os.listdir(events_dir)):
             if not fname.endswith(".schema.json"):
                 continue
-            with open(os.path.join(events_dir, fname), "r") as f:
-                sch = json.load(f)
+            with open(os.path.join(events_dir, fname), "rb") as f:
+                sch = orjson.loads(f.read())
             # Each event schema must have a unique $id; we index by it.
             store[sch["$id"]] = sch
 
@@ -75,18 +289,26 @@ class SchemaRegistry:
           includes the envelope via `allOf`, so one validation pass enforces both.
         - We select the appropriate validator class based on the target schema's $schema.
         """
+        if not self.validate_events:
+            return
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+
         event_type = evt.get("event_type")
-        if event_type not in EVENT_SCHEMA_IDS:
+        idx = _EVENT_TYPE_INDEX.get(event_type)
+        if idx is None:
             raise ValueError(f"Unknown event_type '{event_type}'")
 
-        schema_id = EVENT_SCHEMA_IDS[event_type]
-        schema = self.store.get(schema_id)
-        if schema is None:
-            raise RuntimeError(f"Schema not loaded for $id={schema_id}")
+        # Prefer the code-generated checker (straight-line Python, no schema
+        # walk); contracts it couldn't express use the interpretive validator.
+        fast = self._fast_validators[idx]
+        if fast is not None:
+            fast(evt)
+            return
 
-        # Pick a validator that matches the schema's declared metaschema.
-        Validator = validator_for(schema)
-        Validator.check_schema(schema)
+        validator = self._validators[idx]
+        if validator is None:
+            raise RuntimeError(f"Schema not loaded for $id={EVENT_SCHEMA_IDS[event_type]}")
 
         # Validate once against the composed event schema (which `$ref`s the envelope).
-        Validator(schema, resolver=self.resolver).validate(evt)
+        validator.validate(evt)
@@ -1,33 +1,69 @@
+import math
+import os
 import uuid
 import random
 from datetime import datetime, timezone, timedelta
 from typing import List
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba not installed; run the kernels as plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(fn):
+            return fn
+        return wrap
+
 def uuid4() -> str:
     return str(uuid.uuid4())
 
+def uuid4_batch(n: int) -> List[str]:
+    """
+    Generate n random UUID4 strings from a single os.urandom call.
+
+    One 16*n-byte draw replaces n syscalls; version/variant bits are patched
+    per RFC 4122 and the canonical dashed form is built from the hex digest
+    directly, skipping uuid module dispatch entirely.
+    """
+    if n <= 0:
+        return []
+    buf = bytearray(os.urandom(16 * n))
+    out = []
+    for off in range(0, 16 * n, 16):
+        buf[off + 6] = (buf[off + 6] & 0x0F) | 0x40
+        buf[off + 8] = (buf[off + 8] & 0x3F) | 0x80
+        h = buf[off:off + 16].hex()
+        out.append(f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}")
+    return out
+
 def utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
 def rfc3339(ts) -> str:
+    # Everything the generator produces is already tz-aware UTC, so the
+    # common path skips the astimezone allocation and swaps the fixed-width
+    # "+00:00" suffix for "Z" by slice instead of scanning with replace.
+    if ts.tzinfo is timezone.utc:
+        return ts.isoformat()[:-6] + "Z"
     return ts.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
 
 def clamp(x: float, lo: float, hi: float) -> float:
     return max(lo, min(hi, x))
 
-def deltas_minutes(lo: int, hi: int) -> timedelta:
-    return timedelta(minutes=random.randint(lo, hi))
-
-def normal_minutes(mu: float, sd: float, lo: float) -> timedelta:
-    val = max(random.gauss(mu, sd), lo)
-    return timedelta(minutes=val)
-
+@njit(cache=True)
 def poisson_knuth(lam: float) -> int:
     """
-    Draw a Poisson(λ) variate using Knuth's algorithm. 
+    Draw a Poisson(λ) variate using Knuth's algorithm.
     Accurate and simple for small-to-moderate λ (our rate is per second).
+
+    The multiply-until loop is pure interpreter overhead per draw; numba
+    (when installed) compiles it and its random.random() calls to native
+    code. Without numba it runs as the same plain-Python loop.
     """
-    import math
     L = math.exp(-lam)
     k = 0
     p = 1.0
@@ -36,9 +72,14 @@ def poisson_knuth(lam: float) -> int:
         p *= random.random()
     return k - 1
 
-def exponential_gaps(k: int, rate_per_sec: float) -> List[float]:
-    """Return k exponential inter-arrival gaps in seconds (mean 1/rate)."""
+@njit(cache=True)
+def exponential_gaps(k: int, rate_per_sec: float) -> np.ndarray:
+    """Return k exponential inter-arrival gaps in seconds (mean 1/rate).
+
+    One vectorized draw instead of k expovariate calls; callers only index
+    and len() the result, so the ndarray return is a drop-in for the old
+    list.
+    """
     if k <= 0 or rate_per_sec <= 0:
-        return []
-    mean_gap = 1.0 / rate_per_sec
-    return [random.expovariate(1.0 / mean_gap) for _ in range(k)]
+        return np.empty(0, dtype=np.float64)
+    return np.random.exponential(1.0 / rate_per_sec, k)
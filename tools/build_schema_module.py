@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Compile the JSON Schema contracts into an importable Python module.
+
+Reads services/data_contracts/schemas (envelope + events/*.schema.json) and
+writes _compiled.py next to them containing:
+
+    ENVELOPE        the envelope schema dict
+    EVENTS          {schema $id: schema dict} for every event contract
+    ALLOWED_FIELDS  {event_type: frozenset of allowed property names}
+
+At runtime the generator and schema registry import this module when it
+exists instead of listing and parsing ~10 JSON files per process start;
+the JSON files stay the source of truth. Re-run after any contract change:
+
+    python tools/build_schema_module.py [schema_dir]
+"""
+
+import json
+import os
+import pprint
+import sys
+
+HEADER = '''\
+"""Compiled schema contracts.
+
+GENERATED by tools/build_schema_module.py -- do not edit by hand.
+Regenerate after any contract change:
+
+    python tools/build_schema_module.py
+"""
+'''
+
+
+def _default_schema_dir() -> str:
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(repo_root, "services", "data_contracts", "schemas")
+
+
+def build(schema_dir: str) -> str:
+    envelope_path = os.path.join(schema_dir, "event-envelope.schema.json")
+    events_dir = os.path.join(schema_dir, "events")
+    with open(envelope_path, "r", encoding="utf-8") as f:
+        envelope = json.load(f)
+
+    events = {}
+    allowed_fields = {}
+    envelope_props = set(envelope.get("properties", {}))
+    for fname in sorted(os.listdir(events_dir)):
+        if not fname.endswith(".schema.json"):
+            continue
+        with open(os.path.join(events_dir, fname), "r", encoding="utf-8") as f:
+            schema = json.load(f)
+        events[schema["$id"]] = schema
+
+        # 'parcel-created.schema.json' -> 'PARCEL_CREATED' (same rule as the
+        # generator's filesystem loader)
+        event_type = fname[:-len(".schema.json")].upper().replace("-", "_")
+        allowed = set(envelope_props)
+        all_of = schema.get("allOf") or []
+        if len(all_of) >= 2:
+            allowed.update(all_of[1].get("properties", {}))
+        allowed_fields[event_type] = allowed
+
+    lines = [HEADER]
+    lines.append("ENVELOPE = " + pprint.pformat(envelope, width=100, sort_dicts=False))
+    lines.append("")
+    lines.append("EVENTS = {")
+    for sid, schema in events.items():
+        body = pprint.pformat(schema, width=100, sort_dicts=False)
+        lines.append(f"    {sid!r}:")
+        lines.append("        " + body.replace("\n", "\n        ") + ",")
+    lines.append("}")
+    lines.append("")
+    lines.append("ALLOWED_FIELDS = {")
+    for event_type in sorted(allowed_fields):
+        lines.append(f"    {event_type!r}: frozenset({sorted(allowed_fields[event_type])!r}),")
+    lines.append("}")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    schema_dir = sys.argv[1] if len(sys.argv) > 1 else _default_schema_dir()
+    out_path = os.path.join(schema_dir, "_compiled.py")
+    source = build(schema_dir)
+    compile(source, out_path, "exec")  # fail here, not at first import
+    with open(out_path, "w", encoding="utf-8") as f:
+        f.write(source)
+    print(f"wrote {out_path}")
+
+
+if __name__ == "__main__":
+    main()